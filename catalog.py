@@ -18,22 +18,94 @@ Usage:
 """
 
 import argparse
+import os
 import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
 
 from catalog_store import CatalogStore
-from copier import build_destination_path, copy_file
+from catalog_store_sqlite import open_catalog_store
+from copier import build_destination_path, copy_file, copy_file_hashed
 from excludes import DEFAULT_EXCLUDE_FILE, Excludes, build_excludes
 from exif_reader import get_media_date
-from hasher import compute_hash
+from hasher import _BLAKE3_AVAILABLE, STREAMING_ALGOS, compute_hash, hash_factory
 from models import FileRecord, ScanSummary
-from scanner import count_files, scan_directory
+from scanner import scan_directory_with_stat
+
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
 
 
 # ── Core pipeline ─────────────────────────────────────────────────────────────
 
+def _stat_fingerprint(st: os.stat_result) -> str:
+    """
+    Identify a file's current contents by its stat(): same inode, size and
+    mtime means the data is taken to be unchanged since it was hashed.
+    """
+    return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def _size_and_hash(
+    file_path: Path,
+    st: Optional[os.stat_result],
+    hash_algo: str,
+    store: CatalogStore,
+    skip_unique: bool,
+) -> Tuple[int, Optional[str]]:
+    """
+    Return (size, hash) for file_path, taking the size from st when the scan
+    supplied one.  A file whose fingerprint the catalog already knows is not
+    read; its recorded hash is returned.  When skip_unique is set and no
+    cataloged file has the same size, the file cannot be a duplicate and the
+    hash is not computed (returned as None).
+    """
+    if st is None:
+        st = file_path.stat()
+    size = st.st_size
+    known = store.lookup_fingerprint(_stat_fingerprint(st))
+    if known is not None:
+        return size, known
+    if skip_unique and not store.contains_size(size):
+        return size, None
+    return size, compute_hash(file_path, algo=hash_algo)
+
+
+def _on_other_device(source_path: Path, target_root: Path) -> bool:
+    """True if source and target are known to be on different filesystems."""
+    try:
+        return source_path.stat().st_dev != target_root.stat().st_dev
+    except OSError:
+        return False
+
+
+def _submit_ahead(
+    pool: ThreadPoolExecutor,
+    files: Iterable[tuple],
+    fn: Callable[[Path, Optional[os.stat_result]], Any],
+    depth: int,
+) -> Iterator[Tuple[Path, str, Optional[os.stat_result], Future]]:
+    """
+    Submit fn(file_path, stat_result) jobs to pool and yield
+    (file_path, category, stat_result, future) in scan order, keeping up to
+    depth jobs in flight ahead of the consumer.  files holds
+    (file_path, category) pairs, optionally followed by the scan's
+    stat_result (None when absent).
+    """
+    pending: deque = deque()
+    for file_path, category, *rest in files:
+        st = rest[0] if rest else None
+        pending.append((file_path, category, st, pool.submit(fn, file_path, st)))
+        if len(pending) >= depth:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
 def process_source(
     source_path: Path,
     target_root: Path,
@@ -42,62 +114,109 @@ def process_source(
     dry_run: bool,
     verbose: bool,
     excludes: Excludes,
+    workers: int = 1,
+    files: Optional[Iterable[tuple]] = None,
 ) -> ScanSummary:
-    """Full scan-and-copy pipeline for one source directory."""
+    """
+    Full scan-and-copy pipeline for one source directory.
+
+    Hashing runs on a pool of `workers` threads (hashlib releases the GIL);
+    catalog lookups, copies and summary updates stay on the calling thread
+    and are applied in scan order.  Hashes are submitted ahead of the
+    consumer, so while one file is being copied the next ones are already
+    being read and hashed.  Each cataloged source file's stat fingerprint
+    is remembered, so on later runs an unchanged file is not read at all.
+
+    files may carry a scan_directory() or scan_directory_with_stat() result
+    the caller already holds, so the source tree is not walked a second time;
+    with the latter, file sizes and filesystem dates come from the scan's stat.
+    """
     summary = ScanSummary(source_path=str(source_path))
     copies_since_save = 0
 
-    for file_path, category in scan_directory(source_path, excludes=excludes):
-        summary.files_scanned += 1
+    # A file whose size no cataloged file has cannot be a duplicate, so its
+    # hash is only needed for the record.  A dry run needs none at all.  A
+    # real run from another filesystem hashes it while copying, reading the
+    # source once; on the same filesystem the copy may be a clone or an
+    # in-kernel copy that a hashing copy would bypass, so hash up front.
+    fuse_hash = (
+        not dry_run
+        and hash_algo in STREAMING_ALGOS
+        and _on_other_device(source_path, target_root)
+    )
+    new_hash = hash_factory(hash_algo) if fuse_hash else None
+    fingerprint = partial(
+        _size_and_hash, hash_algo=hash_algo, store=store,
+        skip_unique=dry_run or fuse_hash,
+    )
 
-        try:
-            file_hash = compute_hash(file_path, algo=hash_algo)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        if files is None:
+            files = scan_directory_with_stat(source_path, excludes=excludes)
+        for file_path, category, st, future in _submit_ahead(
+            pool, files, fingerprint, depth=workers * 2
+        ):
+            summary.files_scanned += 1
+
+            try:
+                file_size, file_hash = future.result()
+
+                if file_hash is None and fuse_hash and store.contains_size(file_size):
+                    # A same-size file was cataloged after this lookup was queued
+                    file_hash = compute_hash(file_path, algo=hash_algo)
+
+                if file_hash is not None and store.contains(file_hash):
+                    # Record this source path even though the file won't be re-copied
+                    store.add_location(file_hash, str(file_path))
+                    store.add_fingerprint(_stat_fingerprint(st or file_path.stat()), file_hash)
+                    summary.files_skipped += 1
+                    if verbose:
+                        print(f"  SKIP   {file_path}")
+                    continue
+
+                date_taken, date_source = get_media_date(file_path, st)
+                dest_path = build_destination_path(
+                    target_root, category, file_path.name
+                )
 
-            if store.contains(file_hash):
-                # Record this source path even though the file won't be re-copied
-                store.add_location(file_hash, str(file_path))
-                summary.files_skipped += 1
+                if not dry_run:
+                    if file_hash is None:
+                        actual_dest, file_hash = copy_file_hashed(
+                            file_path, dest_path, new_hash, date_taken=date_taken,
+                        )
+                    else:
+                        actual_dest = copy_file(file_path, dest_path, date_taken=date_taken)
+                    record = FileRecord(
+                        hash=file_hash,
+                        source_locations=[str(file_path)],
+                        destination_path=str(actual_dest),
+                        category=category,
+                        extension=file_path.suffix.lower(),
+                        date_taken=date_taken.date().isoformat(),
+                        date_source=date_source,
+                        file_size_bytes=file_size,
+                        cataloged_at=datetime.now().isoformat(timespec="seconds"),
+                    )
+                    store.add(record)
+                    store.add_fingerprint(_stat_fingerprint(st or file_path.stat()), file_hash)
+                    copies_since_save += 1
+                    if copies_since_save >= 50:
+                        store.checkpoint()
+                        copies_since_save = 0
+
+                summary.files_copied += 1
                 if verbose:
-                    print(f"  SKIP   {file_path}")
-                continue
-
-            date_taken, date_source = get_media_date(file_path)
-            dest_path = build_destination_path(
-                target_root, category, file_path.name
-            )
+                    action = "DRY-RUN" if dry_run else "COPY"
+                    print(f"  {action}  [{category}]  {file_path.name}")
 
-            if not dry_run:
-                actual_dest = copy_file(file_path, dest_path, date_taken=date_taken)
-                record = FileRecord(
-                    hash=file_hash,
-                    source_locations=[str(file_path)],
-                    destination_path=str(actual_dest),
-                    category=category,
-                    extension=file_path.suffix.lower(),
-                    date_taken=date_taken.strftime("%Y-%m-%d"),
-                    date_source=date_source,
-                    file_size_bytes=file_path.stat().st_size,
-                    cataloged_at=datetime.now().isoformat(timespec="seconds"),
-                )
-                store.add(record)
-                copies_since_save += 1
-                if copies_since_save >= 50:
-                    store.save()
-                    copies_since_save = 0
-
-            summary.files_copied += 1
-            if verbose:
-                action = "DRY-RUN" if dry_run else "COPY"
-                print(f"  {action}  [{category}]  {file_path.name}")
-
-        except Exception as e:
-            summary.files_errored += 1
-            summary.errors.append((str(file_path), str(e)))
-            if verbose:
-                print(f"  ERROR  {file_path}: {e}", file=sys.stderr)
+            except Exception as e:
+                summary.files_errored += 1
+                summary.errors.append((str(file_path), str(e)))
+                if verbose:
+                    print(f"  ERROR  {file_path}: {e}", file=sys.stderr)
 
     if not dry_run:
-        store.save()
+        store.checkpoint()
 
     return summary
 
@@ -183,8 +302,24 @@ def build_parser() -> argparse.ArgumentParser:
         help="Target root directory for categorised output.",
     )
     parser.add_argument(
-        "--hash", choices=["sha256", "md5"], default="sha256", dest="hash_algo",
-        help="Hash algorithm for duplicate detection (default: sha256).",
+        "--hash", choices=["sha256", "md5", "blake3", "sha256-tree"], default="sha256",
+        dest="hash_algo",
+        help="Hash algorithm for duplicate detection (default: sha256). "
+             "On CPUs without SHA extensions md5 or blake3 (requires the "
+             "'blake3' package) are faster. sha256-tree hashes files of "
+             "64 MB and up in parallel chunks; their hashes differ from "
+             "plain sha256, so large files cataloged with one are not "
+             "recognised as duplicates under the other.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS, metavar="N",
+        help=f"Number of threads used to hash files in parallel "
+             f"(default: {DEFAULT_WORKERS}).",
+    )
+    parser.add_argument(
+        "--scan-workers", type=int, default=1, metavar="N",
+        help="Number of threads used to list source directories (default: 1). "
+             "Raise it for network shares or spinning disks.",
     )
     parser.add_argument(
         "--dry-run", action="store_true",
@@ -197,7 +332,9 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--catalog-path", metavar="PATH", default=None,
         help="Override the default catalog file location "
-             "(default: TARGET/media_catalog.json).",
+             "(default: TARGET/media_catalog.json). A .db/.sqlite path "
+             "stores the catalog in SQLite, importing an existing JSON "
+             "catalog of the same name on first use.",
     )
     parser.add_argument(
         "--exclude", nargs="+", metavar="PATTERN", default=[],
@@ -219,6 +356,14 @@ def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
 
+    if args.hash_algo == "blake3" and not _BLAKE3_AVAILABLE:
+        parser.error("--hash blake3 requires the 'blake3' package (pip install blake3)")
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.scan_workers < 1:
+        parser.error("--scan-workers must be at least 1")
+
     # Validate source paths
     sources: List[Path] = []
     for raw in args.source:
@@ -254,7 +399,7 @@ def main() -> None:
         print(f"Excludes : {excludes.describe()}")
 
     # Load catalog
-    store = CatalogStore(catalog_path)
+    store = open_catalog_store(catalog_path, dry_run=args.dry_run)
     print(f"Catalog  : {catalog_path}  ({store.record_count():,} existing entries)")
 
     if args.dry_run:
@@ -262,21 +407,34 @@ def main() -> None:
 
     # Process each source directory
     summaries: List[ScanSummary] = []
-    for source_path in sources:
-        total = count_files(source_path, excludes=excludes)
-        print(f"\nScanning : {source_path}  ({total:,} files found)")
-        summary = process_source(
-            source_path=source_path,
-            target_root=target_root,
-            store=store,
-            hash_algo=args.hash_algo,
-            dry_run=args.dry_run,
-            verbose=args.verbose,
-            excludes=excludes,
-        )
-        summaries.append(summary)
-
-    print_summary(summaries, store, catalog_path, dry_run=args.dry_run)
+    try:
+        for source_path in sources:
+            # One traversal: the listing sizes the report and feeds the pipeline
+            files = list(scan_directory_with_stat(
+                source_path, excludes=excludes, workers=args.scan_workers,
+            ))
+            print(f"\nScanning : {source_path}  ({len(files):,} files found)")
+            summary = process_source(
+                source_path=source_path,
+                target_root=target_root,
+                store=store,
+                hash_algo=args.hash_algo,
+                dry_run=args.dry_run,
+                verbose=args.verbose,
+                excludes=excludes,
+                workers=args.workers,
+                files=files,
+            )
+            summaries.append(summary)
+
+        # Sources only append to the checkpoint log; compact it once at the end
+        if not args.dry_run:
+            store.save()
+
+        print_summary(summaries, store, catalog_path, dry_run=args.dry_run)
+    finally:
+        # Releases the SQLite connection and its -wal/-shm files
+        store.close()
 
 
 if __name__ == "__main__":
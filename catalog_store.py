@@ -4,7 +4,13 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from models import FileRecord
+from models import FileRecord, _intern_fields
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
 
 CATALOG_FILENAME = "media_catalog.json"
 CATALOG_VERSION = "1.0"
@@ -14,6 +20,49 @@ def _now_iso() -> str:
     return datetime.now().isoformat(timespec="seconds")
 
 
+def _loads(raw: bytes) -> dict:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    # handle one exception type whichever parser ran.
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _dumps(data: dict) -> bytes:
+    """Serialize as UTF-8, 2-space indented JSON with a trailing newline."""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# fdatasync skips the metadata flush fsync does; macOS only has fsync
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _fsync_dir(dir_path: Path) -> None:
+    """
+    Persist a rename within dir_path.  Directories cannot be opened on
+    Windows, where os.replace is durable without this; errors are ignored.
+    """
+    try:
+        fd = os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _dumps_line(entry: dict) -> bytes:
+    """Serialize one entry as a compact JSON line for the append log."""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
 class CatalogStore:
     """
     Manages a JSON catalog at target_root/media_catalog.json.
@@ -23,32 +72,60 @@ class CatalogStore:
       "version": "1.0",
       "created_at": "<ISO datetime>",
       "updated_at": "<ISO datetime>",
-      "entries": { "<sha256>": { ...FileRecord fields... } }
+      "entries": { "<sha256>": { ...FileRecord fields... } },
+      "source_fingerprints": { "<dev>:<ino>:<size>:<mtime_ns>": "<sha256>" }
     }
 
-    Entries are keyed by hash for O(1) duplicate lookup.
+    Entries are keyed by hash for O(1) duplicate lookup.  Source fingerprints
+    remember the hash of each source file seen, so an unchanged file is
+    recognised on later runs from its stat() alone, without re-reading it.
+
+    Between full saves, checkpoint() appends changed entries as JSON lines to
+    a sibling .log file (media_catalog.log) instead of rewriting the whole
+    catalog.  Loading replays the log over the snapshot; save() writes a new
+    snapshot and removes the log.
     """
 
     def __init__(self, catalog_path: Path) -> None:
         self._path = catalog_path
+        self._log_path = catalog_path.with_suffix(".log")
         self._entries: dict[str, dict] = {}
         self._metadata: dict = {}
+        self._fingerprints: dict[str, str] = {}
+        # Hashes added or updated since the last checkpoint()/save()
+        self._dirty: dict[str, None] = {}
         self._load()
+        self._replay_log()
+        # Sizes of cataloged files: a file whose size is absent cannot be a
+        # duplicate, so callers may skip hashing it for the lookup.
+        self._sizes: set[int] = set()
+        # An entry without a recorded size could match a file of any size
+        self._sizes_complete = True
+        for e in self._entries.values():
+            size = e.get("file_size_bytes")
+            if size is None:
+                self._sizes_complete = False
+            else:
+                self._sizes.add(size)
 
     def _load(self) -> None:
         if self._path.exists():
             try:
-                with open(self._path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                with open(self._path, "rb") as f:
+                    data = _loads(f.read())
                 self._entries = data.get("entries", {})
+                for entry in self._entries.values():
+                    _intern_fields(entry)
+                self._fingerprints = data.get("source_fingerprints", {})
                 self._metadata = {
                     "version": data.get("version", CATALOG_VERSION),
                     "created_at": data.get("created_at", _now_iso()),
                     "updated_at": data.get("updated_at", _now_iso()),
                 }
-            except (json.JSONDecodeError, OSError):
+            except (json.JSONDecodeError, UnicodeDecodeError, OSError):
                 # Corrupted catalog — start fresh
                 self._entries = {}
+                self._fingerprints = {}
                 self._metadata = {
                     "version": CATALOG_VERSION,
                     "created_at": _now_iso(),
@@ -62,13 +139,39 @@ class CatalogStore:
                 "updated_at": _now_iso(),
             }
 
+    def _replay_log(self) -> None:
+        """Apply entries checkpointed after the snapshot was written."""
+        try:
+            with open(self._log_path, "rb") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                entry = _loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                # Torn final line from an interrupted checkpoint
+                continue
+            if isinstance(entry, dict) and "hash" in entry:
+                self._entries[entry["hash"]] = _intern_fields(entry)
+
     def contains(self, file_hash: str) -> bool:
         """Return True if hash is already cataloged."""
         return file_hash in self._entries
 
+    def contains_size(self, size: int) -> bool:
+        """
+        Return True if any cataloged file has this size.
+        May report stale sizes of removed entries, never misses a live one
+        (if any entry lacks a size, every size is reported as present).
+        """
+        return not self._sizes_complete or size in self._sizes
+
     def add(self, record: FileRecord) -> None:
         """Insert a new FileRecord keyed by its hash."""
         self._entries[record.hash] = record.to_dict()
+        self._sizes.add(record.file_size_bytes)
+        self._dirty[record.hash] = None
 
     def add_location(self, file_hash: str, new_path: str) -> bool:
         """
@@ -82,9 +185,21 @@ class CatalogStore:
         locations = entry.setdefault("source_locations", [])
         if new_path not in locations:
             locations.append(new_path)
+            self._dirty[file_hash] = None
             return True
         return False
 
+    def lookup_fingerprint(self, fingerprint: str) -> Optional[str]:
+        """Return the hash recorded for a source file fingerprint, or None."""
+        return self._fingerprints.get(fingerprint)
+
+    def add_fingerprint(self, fingerprint: str, file_hash: str) -> None:
+        """
+        Remember file_hash for a source file fingerprint.  Fingerprints are
+        written by save() only; losing them in a crash just means re-hashing.
+        """
+        self._fingerprints[fingerprint] = file_hash
+
     def get(self, file_hash: str) -> Optional[FileRecord]:
         """Return the FileRecord for a hash, or None."""
         entry = self._entries.get(file_hash)
@@ -96,21 +211,57 @@ class CatalogStore:
         """Return total number of cataloged entries."""
         return len(self._entries)
 
+    def checkpoint(self) -> None:
+        """
+        Append entries changed since the last checkpoint to the log and
+        sync it to disk.  Cost is proportional to the changes, not to the
+        catalog size.
+        """
+        if not self._dirty:
+            return
+        lines = [
+            _dumps_line(self._entries[h]) for h in self._dirty if h in self._entries
+        ]
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._log_path, "ab") as f:
+            f.write(b"".join(lines))
+            f.flush()
+            # Copied files must not outlive their catalog entries in a crash
+            _fdatasync(f.fileno())
+        self._dirty.clear()
+
     def save(self) -> None:
         """
-        Atomically write catalog to disk.
+        Atomically write catalog to disk and drop the checkpoint log.
         Writes to a .tmp file first, then renames to avoid corruption.
         """
         self._metadata["updated_at"] = _now_iso()
+        # Drop fingerprints of files whose entry has since been removed
+        self._fingerprints = {
+            fp: h for fp, h in self._fingerprints.items() if h in self._entries
+        }
         data = {
             **self._metadata,
             "entries": self._entries,
+            "source_fingerprints": self._fingerprints,
         }
         tmp_path = self._path.with_suffix(".tmp")
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(tmp_path, "wb") as f:
+            f.write(_dumps(data))
+            f.flush()
+            os.fsync(f.fileno())
+        # Data is on disk before the rename, and the rename is on disk before
+        # the log it supersedes is removed
         os.replace(tmp_path, self._path)
+        _fsync_dir(self._path.parent)
+        # The snapshot now holds everything the log did; replaying a log
+        # left behind by a crash right here would be harmless.
+        self._log_path.unlink(missing_ok=True)
+        self._dirty.clear()
+
+    def close(self) -> None:
+        """Nothing to release; the catalog file is only open inside save()."""
 
     @staticmethod
     def catalog_path_for(target_root: Path) -> Path:
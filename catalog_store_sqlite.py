@@ -0,0 +1,213 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from catalog_store import CATALOG_VERSION, CatalogStore, _now_iso
+from models import FileRecord, _intern_fields
+
+# Catalog paths with one of these suffixes are opened as SQLite databases
+SQLITE_SUFFIXES = frozenset({".db", ".sqlite", ".sqlite3"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    hash             TEXT PRIMARY KEY,
+    source_locations TEXT NOT NULL,     -- JSON array of source paths
+    destination_path TEXT NOT NULL,
+    category         TEXT NOT NULL,
+    extension        TEXT NOT NULL,
+    date_taken       TEXT NOT NULL,
+    date_source      TEXT NOT NULL,
+    file_size_bytes  INTEGER NOT NULL,
+    cataloged_at     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_size ON entries (file_size_bytes);
+CREATE TABLE IF NOT EXISTS source_fingerprints (
+    fingerprint TEXT PRIMARY KEY,       -- "<dev>:<ino>:<size>:<mtime_ns>"
+    hash        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_COLUMNS = (
+    "hash", "source_locations", "destination_path", "category", "extension",
+    "date_taken", "date_source", "file_size_bytes", "cataloged_at",
+)
+
+
+class SqliteCatalogStore:
+    """
+    Manages a catalog in an SQLite database (WAL journal, one row per hash).
+
+    Same interface as CatalogStore, but nothing is parsed at startup and
+    add() is a single row write instead of a full-file rewrite: lookups are
+    primary-key point queries and save() just commits the open transaction.
+
+    If the database is new and json_import_path names an existing JSON
+    catalog, its entries are imported once.
+    """
+
+    def __init__(self, db_path: Path, json_import_path: Optional[Path] = None) -> None:
+        self._path = db_path
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # Hashing workers call lookup_fingerprint() and contains_size() on
+        # every run; every access goes through self._lock so one connection
+        # can be shared safely.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        now = _now_iso()
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO metadata (key, value) VALUES (?, ?)",
+            [("version", CATALOG_VERSION), ("created_at", now), ("updated_at", now)],
+        )
+        self._conn.commit()
+
+        if (
+            json_import_path is not None
+            and json_import_path.exists()
+            and self.record_count() == 0
+        ):
+            self._import_json(json_import_path)
+
+    def _import_json(self, json_path: Path) -> None:
+        legacy = CatalogStore(json_path)
+        for entry in legacy._entries.values():
+            self.add(FileRecord.from_dict(entry))
+        for fingerprint, file_hash in legacy._fingerprints.items():
+            self.add_fingerprint(fingerprint, file_hash)
+        self.save()
+
+    def _fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def contains(self, file_hash: str) -> bool:
+        """Return True if hash is already cataloged."""
+        return self._fetchone(
+            "SELECT 1 FROM entries WHERE hash = ?", (file_hash,)
+        ) is not None
+
+    def contains_size(self, size: int) -> bool:
+        """Return True if any cataloged file has this size."""
+        return self._fetchone(
+            "SELECT 1 FROM entries WHERE file_size_bytes = ? LIMIT 1", (size,)
+        ) is not None
+
+    def add(self, record: FileRecord) -> None:
+        """Insert a new FileRecord keyed by its hash (replacing any existing row)."""
+        d = record.to_dict()
+        d["source_locations"] = json.dumps(d["source_locations"], ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO entries ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                tuple(d[c] for c in _COLUMNS),
+            )
+
+    def add_location(self, file_hash: str, new_path: str) -> bool:
+        """
+        Append new_path to the source_locations list of an existing entry.
+        Returns True if the path was new and added, False if already present
+        or if the hash is not in the catalog.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source_locations FROM entries WHERE hash = ?", (file_hash,)
+            ).fetchone()
+            if row is None:
+                return False
+            locations = json.loads(row[0])
+            if new_path in locations:
+                return False
+            locations.append(new_path)
+            self._conn.execute(
+                "UPDATE entries SET source_locations = ? WHERE hash = ?",
+                (json.dumps(locations, ensure_ascii=False), file_hash),
+            )
+            return True
+
+    def lookup_fingerprint(self, fingerprint: str) -> Optional[str]:
+        """Return the hash recorded for a source file fingerprint, or None."""
+        row = self._fetchone(
+            "SELECT hash FROM source_fingerprints WHERE fingerprint = ?", (fingerprint,)
+        )
+        return None if row is None else row[0]
+
+    def add_fingerprint(self, fingerprint: str, file_hash: str) -> None:
+        """Remember file_hash for a source file fingerprint."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO source_fingerprints (fingerprint, hash) "
+                "VALUES (?, ?)",
+                (fingerprint, file_hash),
+            )
+
+    def get(self, file_hash: str) -> Optional[FileRecord]:
+        """Return the FileRecord for a hash, or None."""
+        row = self._fetchone(
+            f"SELECT {', '.join(_COLUMNS)} FROM entries WHERE hash = ?", (file_hash,)
+        )
+        if row is None:
+            return None
+        d = dict(zip(_COLUMNS, row))
+        d["source_locations"] = json.loads(d["source_locations"])
+        return FileRecord.from_dict(_intern_fields(d))
+
+    def record_count(self) -> int:
+        """Return total number of cataloged entries."""
+        return self._fetchone("SELECT COUNT(*) FROM entries")[0]
+
+    def save(self) -> None:
+        """
+        Drop fingerprints whose entry has been removed, then commit.  The
+        cleanup scans every fingerprint, so periodic commits during a run
+        use checkpoint() instead.
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM source_fingerprints "
+                "WHERE hash NOT IN (SELECT hash FROM entries)"
+            )
+            self._conn.execute(
+                "UPDATE metadata SET value = ? WHERE key = 'updated_at'",
+                (_now_iso(),),
+            )
+            self._conn.commit()
+
+    def checkpoint(self) -> None:
+        """Commit pending changes; the WAL makes this an incremental write."""
+        with self._lock:
+            self._conn.commit()
+
+    def close(self) -> None:
+        """
+        Commit anything pending and close the connection, which also folds
+        the WAL back into the database.  Unlike save(), leaves updated_at
+        and the fingerprint table alone, so closing after a dry run writes
+        nothing.
+        """
+        self.checkpoint()
+        self._conn.close()
+
+
+def open_catalog_store(catalog_path: Path, dry_run: bool = False):
+    """
+    Open the catalog at catalog_path: SQLite for .db/.sqlite paths, JSON
+    otherwise.  A new SQLite catalog imports the sibling .json catalog once.
+    """
+    if catalog_path.suffix.lower() not in SQLITE_SUFFIXES:
+        return CatalogStore(catalog_path)
+    json_path = catalog_path.with_suffix(".json")
+    if dry_run and not catalog_path.exists():
+        # Don't create the database on a dry run; the JSON store is read-only
+        # until save() and sees the same entries the import would bring in.
+        return CatalogStore(json_path)
+    return SqliteCatalogStore(catalog_path, json_import_path=json_path)
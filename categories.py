@@ -117,6 +117,18 @@ CATEGORY_OTHERS = "others"
 ALL_CATEGORIES = frozenset(CATEGORY_MAP.values()) | {CATEGORY_OTHERS}
 
 
+def categorize_name(name: str) -> str:
+    """
+    Return the category for a bare file name, as categorize_file does,
+    without building a Path.  Used on the scanner's hot path.
+    """
+    # Same rule as Path.suffix: a leading dot (".jpg") is not an extension
+    i = name.rfind(".")
+    if i <= 0:
+        return CATEGORY_OTHERS
+    return CATEGORY_MAP.get(name[i:].lower(), CATEGORY_OTHERS)
+
+
 def categorize_file(file_path: Path) -> str:
     """
     Return the category name for file_path based on its extension.
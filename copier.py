@@ -1,11 +1,15 @@
 import ctypes
 import ctypes.util
+import errno
 import os
 import platform
 import shutil
+import sys
 from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
 
 from exif_reader import _is_null_timestamp
+from hasher import _advise_sequential
 
 MAX_COLLISION_ATTEMPTS = 999
 
@@ -27,6 +31,25 @@ def build_destination_path(
 
 # ── Collision resolution ──────────────────────────────────────────────────────
 
+# Names known to exist in each target directory, listed once on the first
+# collision there and extended with every file copied there since.  Only
+# "taken" answers are trusted: a name that looks free is still confirmed on
+# disk, so files created behind our back are never clobbered.  A name is
+# only recorded once its file exists, so a failed copy leaves no gap.
+_dir_cache: Dict[Path, Set[str]] = {}
+
+
+def _known_names(parent: Path) -> Set[str]:
+    names = _dir_cache.get(parent)
+    if names is None:
+        try:
+            names = set(os.listdir(parent))
+        except OSError:
+            names = set()
+        _dir_cache[parent] = names
+    return names
+
+
 def resolve_collision(dest_path: Path) -> Path:
     """
     If dest_path already exists, append _2, _3, … to the stem until a free
@@ -35,14 +58,20 @@ def resolve_collision(dest_path: Path) -> Path:
     if not dest_path.exists():
         return dest_path
 
+    parent = dest_path.parent
     stem = dest_path.stem
     suffix = dest_path.suffix
-    parent = dest_path.parent
+    names = _known_names(parent)
+    names.add(dest_path.name)
 
     for counter in range(2, MAX_COLLISION_ATTEMPTS + 2):
-        candidate = parent / f"{stem}_{counter}{suffix}"
+        name = f"{stem}_{counter}{suffix}"
+        if name in names:
+            continue
+        candidate = parent / name
         if not candidate.exists():
             return candidate
+        names.add(name)
 
     raise RuntimeError(
         f"Could not resolve filename collision after {MAX_COLLISION_ATTEMPTS} "
@@ -142,16 +171,190 @@ def preserve_timestamps(dest_path: Path, source_path: Path, date_taken=None) ->
 
 # ── File copy ─────────────────────────────────────────────────────────────────
 
+# Bytes requested per copy_file_range(2) call
+_COPY_RANGE_CHUNK = 1 << 30
+
+# Buffer for the userspace fallback copy (shutil defaults to 64 KB on POSIX)
+COPY_BUFSIZE = 1 << 20  # 1 MB
+
+# copy_file_range / sendfile errors meaning "not supported here" rather
+# than I/O failure
+_COPY_RANGE_UNSUPPORTED = frozenset({
+    errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP,
+    errno.EPERM, errno.ETXTBSY,
+})
+
+
+def _clonefile_macos(source_path: Path, dest_path: Path) -> bool:
+    """
+    Create dest_path as an APFS copy-on-write clone using clonefile(2).
+    Returns False (leaving nothing behind) when cloning is not possible,
+    e.g. across volumes or on non-APFS filesystems.
+    """
+    try:
+        CLONE_NOFOLLOW = 0x0001
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        return libc.clonefile(
+            os.fsencode(source_path), os.fsencode(dest_path), CLONE_NOFOLLOW,
+        ) == 0
+    except Exception:
+        return False
+
+
+def _copy_file_range(src_fd: int, dst_fd: int) -> bool:
+    """
+    Copy src_fd to dst_fd in the kernel with copy_file_range(2), which also
+    reflinks on copy-on-write filesystems (btrfs, XFS).
+    Returns False if the call is unsupported and nothing was copied.
+    """
+    copied = 0
+    while True:
+        try:
+            n = os.copy_file_range(src_fd, dst_fd, _COPY_RANGE_CHUNK)
+        except OSError as e:
+            if copied == 0 and e.errno in _COPY_RANGE_UNSUPPORTED:
+                return False
+            raise
+        if n == 0:
+            # Some filesystems report 0 straight away instead of failing
+            return copied > 0
+        copied += n
+
+
+def _sendfile(src_fd: int, dst_fd: int) -> bool:
+    """
+    Copy src_fd to dst_fd with sendfile(2): still zero-copy, and works on
+    Linux kernels and filesystems where copy_file_range cannot (e.g. across
+    filesystems before 5.3).
+    Returns False if the call is unsupported and nothing was copied.
+    """
+    offset = 0
+    while True:
+        try:
+            n = os.sendfile(dst_fd, src_fd, offset, _COPY_RANGE_CHUNK)
+        except OSError as e:
+            if offset == 0 and e.errno in _COPY_RANGE_UNSUPPORTED:
+                return False
+            raise
+        if n == 0:
+            return offset > 0
+        offset += n
+
+
+# sendfile(2) only accepts a regular-file destination on Linux
+_SENDFILE_TO_FILE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
+
+# Sources at least this large have their cached pages dropped once copied
+DROP_CACHE_MIN_SIZE = 16 << 20  # 16 MB
+
+
+def _drop_cached_pages(fd: int) -> None:
+    """
+    Tell the kernel a file just copied won't be read again, so its pages
+    don't push the catalog and other hot data out of the page cache.
+    Where posix_fadvise is unavailable this is a no-op.
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _copy_and_hash(fsrc, fdst, new_hash: Callable) -> str:
+    """Copy fsrc to fdst through one reused buffer, hashing as it goes."""
+    h = new_hash()
+    buf = bytearray(COPY_BUFSIZE)
+    view = memoryview(buf)
+    while n := fsrc.readinto(buf):
+        chunk = view[:n]
+        h.update(chunk)
+        fdst.write(chunk)
+    return h.hexdigest()
+
+
+def _copy_data(
+    source_path: Path,
+    dest_path: Path,
+    new_hash: Optional[Callable] = None,
+) -> Optional[str]:
+    """
+    Copy file contents using the cheapest mechanism the platform offers.
+    With new_hash, the data is instead read once in userspace, hashed and
+    written, and the hex digest is returned.
+    """
+    if (
+        new_hash is None
+        and platform.system() == "Darwin"
+        and _clonefile_macos(source_path, dest_path)
+    ):
+        return None
+    with open(source_path, "rb") as fsrc, open(dest_path, "xb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        digest = None
+        try:
+            if new_hash is not None:
+                _advise_sequential(src_fd)
+                digest = _copy_and_hash(fsrc, fdst, new_hash)
+            elif not (
+                (hasattr(os, "copy_file_range") and _copy_file_range(src_fd, dst_fd))
+                or (_SENDFILE_TO_FILE and _sendfile(src_fd, dst_fd))
+            ):
+                _advise_sequential(src_fd)
+                shutil.copyfileobj(fsrc, fdst, length=COPY_BUFSIZE)
+        except BaseException:
+            # Don't leave a partial copy behind to shadow the name on the next run
+            fdst.close()
+            dest_path.unlink(missing_ok=True)
+            raise
+        if os.fstat(src_fd).st_size >= DROP_CACHE_MIN_SIZE:
+            _drop_cached_pages(src_fd)
+    return digest
+
+
 def copy_file(source_path: Path, dest_path: Path, date_taken=None) -> Path:
     """
     Copy source_path to dest_path, creating parent directories as needed.
     Resolves filename collisions automatically.
+    Data is cloned (APFS) or copied in-kernel (Linux copy_file_range, then
+    sendfile) where possible, falling back to a userspace copy.
     Preserves both mtime and (on macOS) birthtime from the source, or overrides
     them with date_taken if provided.
     Returns the actual destination path used.
     """
+    dest_path, _ = _copy(source_path, dest_path, date_taken, None)
+    return dest_path
+
+
+def copy_file_hashed(
+    source_path: Path,
+    dest_path: Path,
+    new_hash: Callable,
+    date_taken=None,
+) -> Tuple[Path, str]:
+    """
+    Like copy_file, but hash the data with new_hash() while copying it, so
+    the source is read once instead of once for hashing and once for the
+    copy.  The copy always goes through userspace (no clone or in-kernel
+    copy), so prefer copy_file where those apply.
+    Returns (actual destination path, hex digest).
+    """
+    return _copy(source_path, dest_path, date_taken, new_hash)
+
+
+def _copy(
+    source_path: Path,
+    dest_path: Path,
+    date_taken,
+    new_hash: Optional[Callable],
+) -> Tuple[Path, Optional[str]]:
     dest_path = resolve_collision(dest_path)
     dest_path.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(source_path, dest_path)      # copies content + basic timestamps
+    digest = _copy_data(source_path, dest_path, new_hash)
+    cached = _dir_cache.get(dest_path.parent)
+    if cached is not None:
+        cached.add(dest_path.name)
+    shutil.copystat(source_path, dest_path)   # permission bits + basic timestamps
     preserve_timestamps(dest_path, source_path, date_taken=date_taken)  # restore birthtime on macOS
-    return dest_path
+    return dest_path, digest
@@ -14,19 +14,31 @@ File format (one pattern per line):
 """
 
 import fnmatch
+import os
+import re
 from pathlib import Path
-from typing import List, Set
+from typing import FrozenSet, List, Optional, Set
 
 
 DEFAULT_EXCLUDE_FILE = "exclude"
 
+# fnmatch.fnmatch() is case-insensitive wherever the OS folds path case
+_FNMATCH_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+
+
+def _compile(patterns: List[str]) -> Optional["re.Pattern[str]"]:
+    """Union fnmatch patterns into one compiled regex (None if there are none)."""
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns), _FNMATCH_FLAGS)
+
 
 class Excludes:
     def __init__(self, patterns: List[str]) -> None:
         # Normalise and store patterns
         self._dir_patterns: List[str] = []   # match directory names / path segments
         self._file_patterns: List[str] = []  # match file names
-        self._ext_set: Set[str] = set()      # fast extension lookup
+        ext_set: Set[str] = set()            # fast extension lookup
 
         for raw in patterns:
             p = raw.strip()
@@ -39,12 +51,12 @@ class Excludes:
 
             # Leading dot with no wildcard → extension shorthand  (.tmp → *.tmp)
             if p.startswith(".") and "*" not in p:
-                self._ext_set.add(p.lower())
+                ext_set.add(p.lower())
                 continue
 
             # Wildcard extension pattern like *.db
             if p.startswith("*.") and "/" not in p:
-                self._ext_set.add(p[1:].lower())  # store as ".db"
+                ext_set.add(p[1:].lower())  # store as ".db"
                 continue
 
             if dir_only or "/" not in p:
@@ -56,6 +68,14 @@ class Excludes:
                 # Contains slash → match relative path segment sequence
                 self._dir_patterns.append(p)
 
+        # Each bucket is matched with a single regex call instead of a
+        # per-pattern fnmatch loop.
+        self._name_re = _compile([p for p in self._dir_patterns if "/" not in p])
+        self._path_re = _compile([p for p in self._dir_patterns if "/" in p])
+        self._file_re = _compile(self._file_patterns)
+        # Fixed from here on; checked for every scanned file
+        self._ext_set: FrozenSet[str] = frozenset(ext_set)
+
     # ── Public API ────────────────────────────────────────────────────────────
 
     def is_empty(self) -> bool:
@@ -66,16 +86,30 @@ class Excludes:
         Return True if a directory (given as path relative to source root)
         should be skipped entirely.
         """
-        # Check each component of the relative path
-        for part in rel_path.parts:
-            for pattern in self._dir_patterns:
-                if "/" not in pattern:
-                    if fnmatch.fnmatch(part, pattern):
-                        return True
-                else:
-                    # Slash pattern: match against the full relative string
-                    if fnmatch.fnmatch(str(rel_path), pattern):
-                        return True
+        parts = rel_path.parts
+        if not parts:
+            return False
+        # Name patterns: any component of the relative path
+        if self._name_re is not None:
+            match = self._name_re.match
+            if any(match(part) for part in parts):
+                return True
+        # Slash patterns: match against the full relative string
+        if self._path_re is not None and self._path_re.match(rel_path.as_posix()):
+            return True
+        return False
+
+    def should_skip_child(self, name: str, rel_posix: str) -> bool:
+        """
+        should_skip_dir for an entry whose parent directory already passed
+        it: name is the entry's own name and rel_posix its relative path in
+        POSIX form.  Ancestor components were matched when the walk
+        descended, so only the final component and the full path are new.
+        """
+        if self._name_re is not None and self._name_re.match(name):
+            return True
+        if self._path_re is not None and self._path_re.match(rel_posix):
+            return True
         return False
 
     def should_skip_file(self, file_path: Path) -> bool:
@@ -85,9 +119,8 @@ class Excludes:
             return True
 
         # Name / pattern match
-        for pattern in self._file_patterns:
-            if fnmatch.fnmatch(file_path.name, pattern):
-                return True
+        if self._file_re is not None and self._file_re.match(file_path.name):
+            return True
 
         return False
 
@@ -1,3 +1,5 @@
+import os
+import re
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple
@@ -21,8 +23,19 @@ VIDEO_DATE_TAGS = [
     "QuickTime:CreateDate",
 ]
 
+# Lookup order for get_date_from_exif: image EXIF tags take priority over
+# video/QuickTime tags.  Built once rather than concatenated per file.
+_DATE_TAGS = tuple(EXIF_DATE_TAGS + VIDEO_DATE_TAGS)
+
 EXIF_DATE_FORMAT = "%Y:%m:%d %H:%M:%S"
 
+# EXIF_DATE_FORMAT as a regex, accepting what strptime would for it.  Parsing
+# with a compiled pattern avoids strptime's per-call format handling and
+# locale lookups, which dominate date extraction on large imports.
+_EXIF_DATE_RE = re.compile(
+    r"([0-9]{4}):([0-9]{1,2}):([0-9]{1,2})\s+([0-9]{1,2}):([0-9]{1,2}):([0-9]{1,2})"
+)
+
 # Only these extensions carry EXIF or QuickTime metadata that exifread can
 # reliably decode.  Everything else (MPEG-1/2 streams, AVI, MKV, WMV, FLV …)
 # has no standard EXIF container — skip straight to filesystem timestamps.
@@ -40,6 +53,10 @@ _EXIF_CAPABLE = frozenset({
     ".3gp", ".mts", ".m2ts",
 })
 
+# Video containers among the above.  Their dates live in container atoms,
+# never in an EXIF IFD, so a DateTimeOriginal stop tag would never trigger.
+_VIDEO_CONTAINERS = frozenset({".mov", ".mp4", ".m4v", ".3gp", ".mts", ".m2ts"})
+
 # Sentinel dates cameras write when their clock has never been set.
 # Treated as "no valid date" — falls back to filesystem timestamps.
 #   2000-12-31  — Apple/iOS QuickTime default (clock not set, QuickTime path)
@@ -80,9 +97,13 @@ def _parse_exif_date(raw_value: str) -> Optional[datetime]:
     invalid, zeroed, or a known camera-clock-not-set sentinel date.
     """
     try:
-        dt = datetime.strptime(raw_value.strip(), EXIF_DATE_FORMAT)
+        m = _EXIF_DATE_RE.fullmatch(raw_value.strip())
+        if m is None:
+            return None
+        # Raises ValueError for zeroed or out-of-range fields (month 0, day 32 …)
+        dt = datetime(*map(int, m.groups()))
         # Reject structurally impossible values
-        if dt.year < 1970 or dt.month == 0 or dt.day == 0:
+        if dt.year < 1970:
             return None
         # Reject known sentinel/epoch dates (device clock was never configured)
         if dt.date() in _NULL_DATES:
@@ -92,46 +113,49 @@ def _parse_exif_date(raw_value: str) -> Optional[datetime]:
         return None
 
 
+def _first_valid_date(tags: dict) -> Optional[datetime]:
+    """Return the first valid date among _DATE_TAGS in tags, or None."""
+    for tag_name in _DATE_TAGS:
+        if tag_name in tags:
+            dt = _parse_exif_date(str(tags[tag_name]))
+            if dt is not None:
+                return dt
+    return None
+
+
 def get_date_from_exif(file_path: Path) -> Tuple[Optional[datetime], str]:
     """
     Attempt EXIF extraction using exifread.
     Only runs for extensions in _EXIF_CAPABLE; all others return (None, '')
     immediately so that filesystem timestamps are used instead.
+    Stills are parsed up to DateTimeOriginal; only if that tag is present
+    but invalid (zeroed or a sentinel) is the file parsed again in full for
+    the tags that follow it.  Video containers are parsed in full once for
+    their QuickTime date tags.
     Returns (datetime, 'exif') on success, (None, '') on failure.
     """
     if not _EXIFREAD_AVAILABLE:
         return None, ""
 
-    if file_path.suffix.lower() not in _EXIF_CAPABLE:
+    ext = file_path.suffix.lower()
+    if ext not in _EXIF_CAPABLE:
         return None, ""
 
+    options = {"details": False}
+    if ext not in _VIDEO_CONTAINERS:
+        options["stop_tag"] = "DateTimeOriginal"
+
     try:
         with open(file_path, "rb") as f:
-            tags = exifread.process_file(f, stop_tag="DateTimeOriginal", details=False)
-
-        # Try image EXIF tags first
-        for tag_name in EXIF_DATE_TAGS:
-            if tag_name in tags:
-                dt = _parse_exif_date(str(tags[tag_name]))
-                if dt is not None:
-                    return dt, "exif"
-
-        # Try video/QuickTime tags
-        for tag_name in VIDEO_DATE_TAGS:
-            if tag_name in tags:
-                dt = _parse_exif_date(str(tags[tag_name]))
-                if dt is not None:
-                    return dt, "exif"
-
-        # Re-read without stop_tag to catch more tags for videos
-        with open(file_path, "rb") as f:
-            tags = exifread.process_file(f, details=False)
-
-        for tag_name in EXIF_DATE_TAGS + VIDEO_DATE_TAGS:
-            if tag_name in tags:
-                dt = _parse_exif_date(str(tags[tag_name]))
-                if dt is not None:
-                    return dt, "exif"
+            tags = exifread.process_file(f, **options)
+            dt = _first_valid_date(tags)
+            if dt is None and "EXIF DateTimeOriginal" in tags and "stop_tag" in options:
+                # Parsing stopped at an unusable DateTimeOriginal, before
+                # DateTimeDigitized; read the rest of the tags
+                f.seek(0)
+                dt = _first_valid_date(exifread.process_file(f, details=False))
+        if dt is not None:
+            return dt, "exif"
 
     except Exception:
         pass
@@ -139,14 +163,19 @@ def get_date_from_exif(file_path: Path) -> Tuple[Optional[datetime], str]:
     return None, ""
 
 
-def get_date_from_fs(file_path: Path) -> Tuple[datetime, str]:
+def get_date_from_fs(
+    file_path: Path,
+    st: Optional[os.stat_result] = None,
+) -> Tuple[datetime, str]:
     """
     Return the earliest reliable filesystem timestamp with a source label.
 
     Collects available timestamps (birthtime, ctime, mtime), validates them against
     known camera sentinel values, and returns the oldest valid date.
+    st may carry a stat result the caller already holds (e.g. from the scan);
+    otherwise the file is stat'd here.
     """
-    stat = file_path.stat()
+    stat = st if st is not None else file_path.stat()
     candidates = []
 
     # 1. st_birthtime is available on macOS/BSD and on Windows (Python 3.8+)
@@ -175,12 +204,16 @@ def get_date_from_fs(file_path: Path) -> Tuple[datetime, str]:
     return datetime.now(), "import_time"
 
 
-def get_media_date(file_path: Path) -> Tuple[datetime, str]:
+def get_media_date(
+    file_path: Path,
+    st: Optional[os.stat_result] = None,
+) -> Tuple[datetime, str]:
     """
     Try EXIF first, then filesystem timestamps (birthtime → ctime → mtime).
     Always returns a valid (datetime, source_label) tuple.
+    st is passed on to get_date_from_fs.
     """
     dt, source = get_date_from_exif(file_path)
     if dt is not None:
         return dt, source
-    return get_date_from_fs(file_path)
+    return get_date_from_fs(file_path, st)
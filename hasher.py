@@ -1,35 +1,266 @@
 import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
 from pathlib import Path
+from typing import Callable, Optional
 
-CHUNK_SIZE = 65536  # 64 KB
+try:
+    import blake3
+    _BLAKE3_AVAILABLE = True
+except ImportError:
+    _BLAKE3_AVAILABLE = False
 
+# Read size for the chunked fallback; at most one buffer per hashing thread
+CHUNK_SIZE = 1 << 20  # 1 MB
 
-def compute_sha256(file_path: Path) -> str:
-    """Stream-read file and return hex SHA256 digest."""
-    h = hashlib.sha256()
+# Files up to this size are read and hashed in one call (file_digest's
+# own buffer is 256 KB, so above this it would loop anyway)
+SMALL_FILE_SIZE = 256 << 10   # 256 KB
+
+# Per-thread state: the fallback loop's read buffer
+_local = threading.local()
+
+# BLAKE3 hashes files at least this large with multiple threads, fed in
+# BLAKE3_THREADED_BUFSIZE reads (each update() must be big to split well)
+BLAKE3_THREADED_MIN_SIZE = 64 << 20   # 64 MB
+BLAKE3_THREADED_BUFSIZE = 16 << 20    # 16 MB
+
+# hashlib.file_digest (Python 3.11+) runs the read → update loop in C and
+# releases the GIL while hashing.  Older interpreters use the chunked loop.
+_file_digest = getattr(hashlib, "file_digest", None)
+
+
+def _advise_sequential(fd: int) -> None:
+    """
+    Tell the kernel the whole file will be read front to back so it reads
+    ahead aggressively.  Where posix_fadvise is unavailable this is a no-op.
+
+    (Files are deliberately not mmap'd: a source card removed or a file
+    truncated mid-hash would kill the process with SIGBUS instead of raising
+    a per-file OSError.)
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def _chunk_buffer() -> bytearray:
+    """This thread's CHUNK_SIZE read buffer, allocated once per thread."""
+    buf = getattr(_local, "buf", None)
+    if buf is None:
+        buf = _local.buf = bytearray(CHUNK_SIZE)
+    return buf
+
+
+def _digest_stream(f, new_hash: Callable) -> str:
+    """Read the open unbuffered file f to the end and return its hex digest."""
+    fd = f.fileno()
+    if os.fstat(fd).st_size <= SMALL_FILE_SIZE:
+        # One exact-size read and one update(); no read-ahead advice or
+        # buffer set-up for a file that fits in a single read
+        h = new_hash()
+        h.update(f.read())
+        return h.hexdigest()
+    _advise_sequential(fd)
+    if _file_digest is not None:
+        return _file_digest(f, new_hash).hexdigest()
+    # One reused buffer instead of a fresh bytes object per chunk
+    h = new_hash()
+    buf = _chunk_buffer()
+    view = memoryview(buf)
+    while n := f.readinto(buf):
+        h.update(view[:n])
+    return h.hexdigest()
+
+
+def _digest_file(file_path: Path, new_hash: Callable) -> str:
+    """Stream-read file through a fresh hash object and return its hex digest."""
     try:
-        with open(file_path, "rb") as f:
-            while chunk := f.read(CHUNK_SIZE):
-                h.update(chunk)
+        # Unbuffered: file_digest does its own buffering internally
+        with open(file_path, "rb", buffering=0) as f:
+            return _digest_stream(f, new_hash)
     except OSError as e:
         raise OSError(f"Cannot read {file_path}: {e}") from e
-    return h.hexdigest()
+
+
+def _new_sha256():
+    # Duplicate detection is not a security property; usedforsecurity=False
+    # lets OpenSSL pick its fastest provider (SHA-NI / ARMv8 crypto) even on
+    # FIPS-restricted builds.
+    return hashlib.new("sha256", usedforsecurity=False)
+
+
+def _new_md5():
+    return hashlib.new("md5", usedforsecurity=False)
+
+
+def compute_sha256(file_path: Path) -> str:
+    """Stream-read file and return hex SHA256 digest."""
+    return _digest_file(file_path, _new_sha256)
 
 
 def compute_md5(file_path: Path) -> str:
     """Stream-read file and return hex MD5 digest."""
-    h = hashlib.md5()
+    return _digest_file(file_path, _new_md5)
+
+
+def compute_blake3(file_path: Path) -> str:
+    """
+    Stream-read file and return hex BLAKE3 digest.
+    Requires the optional 'blake3' package.  On CPUs without SHA extensions
+    BLAKE3 (and MD5) are considerably faster than SHA-256.
+    """
+    if not _BLAKE3_AVAILABLE:
+        raise RuntimeError("BLAKE3 hashing requires the 'blake3' package")
     try:
-        with open(file_path, "rb") as f:
-            while chunk := f.read(CHUNK_SIZE):
-                h.update(chunk)
+        with open(file_path, "rb", buffering=0) as f:
+            if os.fstat(f.fileno()).st_size < BLAKE3_THREADED_MIN_SIZE:
+                return _digest_stream(f, blake3.blake3)
+            # Large inputs: let blake3 spread each big buffer over its own
+            # thread pool (its tree mode parallelises within one update())
+            _advise_sequential(f.fileno())
+            h = blake3.blake3(max_threads=blake3.blake3.AUTO)
+            buf = bytearray(BLAKE3_THREADED_BUFSIZE)
+            view = memoryview(buf)
+            while n := f.readinto(buf):
+                h.update(view[:n])
+            return h.hexdigest()
     except OSError as e:
         raise OSError(f"Cannot read {file_path}: {e}") from e
-    return h.hexdigest()
+
+
+# ── SHA-256 tree mode ─────────────────────────────────────────────────────────
+
+# Files at least this large are hashed as a tree of TREE_CHUNK_SIZE leaves
+TREE_MIN_SIZE = 64 << 20   # 64 MB
+TREE_CHUNK_SIZE = 8 << 20  # 8 MB
+
+# Tree digests carry this prefix so they never equal a plain SHA-256 digest
+TREE_PREFIX = "tree:"
+
+# Domain separation between leaf and root hashes (as in RFC 6962)
+_LEAF_TAG = b"\x00"
+_ROOT_TAG = b"\x01"
+
+# Algorithms hash_factory() can feed incrementally
+STREAMING_ALGOS = frozenset({"sha256", "md5", "blake3"})
+
+# Leaves are read concurrently at their offsets; os.pread is POSIX-only
+_HAS_PREAD = hasattr(os, "pread")
+
+_tree_pool: Optional[ThreadPoolExecutor] = None
+_tree_pool_lock = threading.Lock()
+
+
+def _get_tree_pool() -> ThreadPoolExecutor:
+    """Shared pool for leaf hashing, created on first use."""
+    global _tree_pool
+    with _tree_pool_lock:
+        if _tree_pool is None:
+            _tree_pool = ThreadPoolExecutor(
+                max_workers=os.cpu_count() or 1, thread_name_prefix="sha256-tree",
+            )
+        return _tree_pool
+
+
+def _seek_read(f, length: int, offset: int) -> bytes:
+    """pread stand-in for platforms without os.pread (one reader only)."""
+    f.seek(offset)
+    return f.read(length)
+
+
+def _hash_leaf(read_at: Callable[[int, int], bytes], offset: int, length: int) -> bytes:
+    """Hash length bytes at offset (fewer at end of file) as one tree leaf."""
+    h = _new_sha256()
+    h.update(_LEAF_TAG)
+    while length > 0:
+        # pread may return less than asked for without being at end of file
+        data = read_at(length, offset)
+        if not data:
+            break
+        h.update(data)
+        offset += len(data)
+        length -= len(data)
+    return h.digest()
+
+
+def compute_sha256_tree(file_path: Path) -> str:
+    """
+    Return a SHA-256 digest that large files compute in parallel.
+
+    Files under TREE_MIN_SIZE get their plain hex SHA-256, same as
+    compute_sha256.  Larger files are split into TREE_CHUNK_SIZE leaves
+    hashed concurrently, and the result is "tree:" + the hex SHA-256 of
+    the chunk size and the leaf digests.  Either way the value depends on
+    the content alone, but a tree digest never matches a plain one.
+    Without os.pread (Windows) the leaves are hashed one after another.
+    """
+    try:
+        with open(file_path, "rb", buffering=0) as f:
+            fd = f.fileno()
+            size = os.fstat(fd).st_size
+            if size < TREE_MIN_SIZE:
+                return _digest_stream(f, _new_sha256)
+            offsets = range(0, size, TREE_CHUNK_SIZE)
+            root = _new_sha256()
+            root.update(_ROOT_TAG)
+            root.update(TREE_CHUNK_SIZE.to_bytes(8, "big"))
+            if not _HAS_PREAD:
+                read_at = partial(_seek_read, f)
+                for offset in offsets:
+                    root.update(_hash_leaf(read_at, offset, TREE_CHUNK_SIZE))
+                return TREE_PREFIX + root.hexdigest()
+            pool = _get_tree_pool()
+            read_at = partial(os.pread, fd)
+            leaves = [
+                pool.submit(_hash_leaf, read_at, offset, TREE_CHUNK_SIZE)
+                for offset in offsets
+            ]
+            try:
+                for leaf in leaves:
+                    root.update(leaf.result())
+            except BaseException:
+                for leaf in leaves:
+                    leaf.cancel()
+                # No leaf may still be reading fd once the file is closed:
+                # the number could by then belong to another worker's file
+                wait(leaves)
+                raise
+            return TREE_PREFIX + root.hexdigest()
+    except OSError as e:
+        raise OSError(f"Cannot read {file_path}: {e}") from e
+
+
+def hash_factory(algo: str = "sha256") -> Callable:
+    """
+    Return a constructor of fresh hash objects for algo ('sha256', 'md5' or
+    'blake3'), for callers that feed data themselves (e.g. while copying).
+    'sha256-tree' is not in STREAMING_ALGOS and cannot be fed this way.
+    """
+    if algo not in STREAMING_ALGOS:
+        raise ValueError(f"{algo} digests cannot be computed incrementally")
+    if algo == "md5":
+        return _new_md5
+    if algo == "blake3":
+        if not _BLAKE3_AVAILABLE:
+            raise RuntimeError("BLAKE3 hashing requires the 'blake3' package")
+        return blake3.blake3
+    return _new_sha256
 
 
 def compute_hash(file_path: Path, algo: str = "sha256") -> str:
-    """Compute hash using the specified algorithm ('sha256' or 'md5')."""
+    """
+    Compute hash using the specified algorithm ('sha256', 'md5', 'blake3'
+    or 'sha256-tree').
+    """
     if algo == "md5":
         return compute_md5(file_path)
+    if algo == "blake3":
+        return compute_blake3(file_path)
+    if algo == "sha256-tree":
+        return compute_sha256_tree(file_path)
     return compute_sha256(file_path)
@@ -1,8 +1,32 @@
+import sys
 from dataclasses import dataclass, field
+from operator import attrgetter
 from typing import List, Tuple
 
+# Serialized key order of a FileRecord (also its field order)
+_FIELDS = (
+    "hash", "source_locations", "destination_path", "category", "extension",
+    "date_taken", "date_source", "file_size_bytes", "cataloged_at",
+)
+_field_values = attrgetter(*_FIELDS)
 
-@dataclass
+# Entry fields with only a handful of distinct values across a catalog
+_LOW_CARDINALITY_FIELDS = ("category", "extension", "date_source")
+
+
+def _intern_fields(entry: dict) -> dict:
+    """
+    Replace low-cardinality string values with interned copies so a large
+    catalog holds one string per distinct value instead of one per entry.
+    """
+    for key in _LOW_CARDINALITY_FIELDS:
+        value = entry.get(key)
+        if type(value) is str:
+            entry[key] = sys.intern(value)
+    return entry
+
+
+@dataclass(slots=True)
 class FileRecord:
     hash: str
     source_locations: List[str]  # every source path where this file has been found
@@ -15,17 +39,7 @@ class FileRecord:
     cataloged_at: str        # ISO datetime of first catalog insertion
 
     def to_dict(self) -> dict:
-        return {
-            "hash": self.hash,
-            "source_locations": self.source_locations,
-            "destination_path": self.destination_path,
-            "category": self.category,
-            "extension": self.extension,
-            "date_taken": self.date_taken,
-            "date_source": self.date_source,
-            "file_size_bytes": self.file_size_bytes,
-            "cataloged_at": self.cataloged_at,
-        }
+        return dict(zip(_FIELDS, _field_values(self)))
 
     @staticmethod
     def from_dict(d: dict) -> "FileRecord":
@@ -51,7 +65,7 @@ class FileRecord:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanSummary:
     source_path: str
     files_scanned: int = 0
@@ -1,7 +1,10 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Generator, Tuple
+from typing import Callable, Generator, Iterator, List, Tuple
 
-from categories import categorize_file
+from categories import categorize_name
 from excludes import Excludes
 
 
@@ -10,58 +13,170 @@ CATALOG_FILENAME = "media_catalog.json"
 _EMPTY_EXCLUDES = Excludes([])
 
 
-def _is_hidden(path: Path) -> bool:
-    """Return True if any component of the relative path starts with a dot."""
-    return any(part.startswith(".") for part in path.parts)
+def _list_dir(dir_path: str) -> List[os.DirEntry]:
+    """
+    Return the entries of dir_path, or [] if it cannot be read.  The listing
+    is materialised so the directory handle is closed before recursing —
+    keeps open descriptors flat on deep trees.
+    """
+    try:
+        with os.scandir(dir_path) as it:
+            return list(it)
+    except OSError:
+        return []
 
 
-def scan_directory(
-    source_path: Path,
-    excludes: Excludes = _EMPTY_EXCLUDES,
-) -> Generator[Tuple[Path, str], None, None]:
+def _list_dir_and_stat(dir_path: str) -> List[os.DirEntry]:
     """
-    Walk source_path recursively, yielding (file_path, category) for every
-    non-hidden, non-zero, non-symlink file.  Unknown extensions land in the
-    'others' category.  Hidden paths, symlinks, zero-byte files, the catalog
-    JSON, and anything matched by excludes are silently skipped.
+    _list_dir for scan worker threads: also fills each file entry's cached
+    lstat(), so on high-latency filesystems (NFS/SMB) those round trips
+    overlap instead of running one by one on the consuming thread.
     """
-    for file_path in source_path.rglob("*"):
-        rel = file_path.relative_to(source_path)
-
-        if _is_hidden(rel):
+    entries = _list_dir(dir_path)
+    for entry in entries:
+        if entry.name.startswith("."):
             continue
-
-        # Directories are never yielded; just used for traversal
-        if file_path.is_dir():
+        try:
+            if entry.is_file(follow_symlinks=False):
+                entry.stat(follow_symlinks=False)
+        except OSError:
+            pass   # the consumer sees the same error and skips the file
+    return entries
+
+
+def _walk(
+    listing: Callable[[], List[os.DirEntry]],
+    rel_prefix: str,
+    excludes: Excludes,
+    schedule: Callable[[str], Callable[[], List[os.DirEntry]]],
+) -> Iterator[Tuple[os.DirEntry, str]]:
+    """
+    Recursively yield (entry, rel_prefix) for every non-hidden regular file
+    in listing() and below.  rel_prefix is the entry's parent relative
+    to the scan root as a POSIX string with a trailing slash ("" at the root),
+    so an entry's relative path is rel_prefix + entry.name — plain string
+    concatenation, no Path objects per entry.
+    Hidden directories and directories matched by excludes are pruned (never
+    listed), symlinked directories are not followed, and unreadable
+    directories are skipped silently.  Symlinks, sockets, FIFOs and devices
+    are dropped here, from the listing's d_type, without a stat() call.
+
+    schedule(path) returns the listing callable for a subdirectory.  All of a
+    directory's subdirectories are scheduled before the first is descended
+    into, so a schedule backed by a thread pool lists them concurrently
+    while the output keeps the serial depth-first order.
+    """
+    kept = []
+    for entry in listing():
+        # Dot-names are hidden; a hidden directory is never descended into,
+        # so no descendant path needs checking component by component.
+        if entry.name.startswith("."):
             continue
-
-        if not file_path.is_file():
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            # Without following links, is_file() is False for a symlink
+            if not is_dir and not entry.is_file(follow_symlinks=False):
+                continue
+        except OSError:
             continue
+        if is_dir:
+            rel = rel_prefix + entry.name
+            # This directory was only listed because its parent passed already
+            if excludes.should_skip_child(entry.name, rel):
+                continue
+            kept.append((entry, rel + "/", schedule(entry.path)))
+        else:
+            kept.append((entry, rel_prefix, None))
+    for entry, rel, sub_listing in kept:
+        if sub_listing is None:
+            yield entry, rel
+        else:
+            yield from _walk(sub_listing, rel, excludes, schedule)
 
-        if file_path.is_symlink():
-            continue
 
-        if file_path.name == CATALOG_FILENAME:
-            continue
+def _walk_source(
+    source_path: Path,
+    excludes: Excludes,
+    workers: int,
+) -> Iterator[Tuple[os.DirEntry, str]]:
+    """_walk from source_path, listing directories on `workers` threads."""
+    if workers <= 1:
+        # Lazy: each directory is listed when the walk reaches it
+        def schedule(path: str) -> Callable[[], List[os.DirEntry]]:
+            return partial(_list_dir, path)
+
+        yield from _walk(schedule(str(source_path)), "", excludes, schedule)
+        return
+
+    pool = ThreadPoolExecutor(max_workers=workers)
 
-        # Skip files inside an excluded directory
-        if rel.parent != Path(".") and excludes.should_skip_dir(rel.parent):
+    def schedule(path: str) -> Callable[[], List[os.DirEntry]]:
+        return pool.submit(_list_dir_and_stat, path).result
+
+    try:
+        yield from _walk(schedule(str(source_path)), "", excludes, schedule)
+    finally:
+        # Also reached when the consumer stops early: drop queued listings
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def scan_directory_with_stat(
+    source_path: Path,
+    excludes: Excludes = _EMPTY_EXCLUDES,
+    workers: int = 1,
+) -> Generator[Tuple[Path, str, os.stat_result], None, None]:
+    """
+    Like scan_directory, but yield (file_path, category, stat_result), where
+    stat_result is the lstat() the zero-byte check already made, so callers
+    need not stat the file again for its size or timestamps.
+    """
+    for entry, rel_prefix in _walk_source(source_path, excludes, workers):
+        # _walk yields regular files only
+        if entry.name == CATALOG_FILENAME:
             continue
 
-        # Skip directories matched by name anywhere in the relative path
-        if excludes.should_skip_dir(rel):
+        # Excluded directories were pruned during the walk; this catches a
+        # file whose own name or relative path matches a directory pattern.
+        if excludes.should_skip_child(entry.name, rel_prefix + entry.name):
             continue
 
+        file_path = Path(entry.path)
+
         # Skip excluded files / extensions
         if excludes.should_skip_file(file_path):
             continue
 
         try:
-            if file_path.stat().st_size == 0:
-                continue
-        except (PermissionError, FileNotFoundError, OSError):
+            # DirEntry caches this; it is the only stat() the scan makes
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            # Vanished or unreadable between listing and stat
             continue
-        yield file_path, categorize_file(file_path)
+        if st.st_size == 0:
+            continue
+        yield file_path, categorize_name(entry.name), st
+
+
+def scan_directory(
+    source_path: Path,
+    excludes: Excludes = _EMPTY_EXCLUDES,
+    workers: int = 1,
+) -> Generator[Tuple[Path, str], None, None]:
+    """
+    Walk source_path recursively, yielding (file_path, category) for every
+    non-hidden, non-zero, non-symlink file.  Unknown extensions land in the
+    'others' category.  Hidden paths, symlinks, zero-byte files, the catalog
+    JSON, and anything matched by excludes are silently skipped.
+
+    Uses os.scandir so entry types come from the directory listing (d_type)
+    and each file costs at most one lstat() for the zero-byte check.
+
+    With workers > 1, directories are listed (and their files stat'd) on a
+    thread pool, which helps on network shares and spinning disks.  The
+    order of results is the same as for a serial scan.
+    """
+    for file_path, category, _ in scan_directory_with_stat(source_path, excludes, workers):
+        yield file_path, category
 
 
 def count_files(
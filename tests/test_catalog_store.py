@@ -1,10 +1,12 @@
 """Tests for catalog_store.py — CatalogStore CRUD, persistence, corruption."""
 import json
+import os
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from catalog_store import CATALOG_FILENAME, CatalogStore
+from catalog_store import _ORJSON_AVAILABLE, CATALOG_FILENAME, CatalogStore
 from models import FileRecord
 
 
@@ -173,6 +175,167 @@ class TestSave:
         store.save()
         assert path.exists()
 
+    @pytest.mark.skipif(os.name == "nt", reason="directories cannot be fsync'd on Windows")
+    def test_save_syncs_file_then_directory(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        store = CatalogStore(path)
+        store.add(_make_record("h1"))
+        calls = []
+        real_replace = os.replace
+        with patch("catalog_store.os.fsync", side_effect=lambda fd: calls.append("fsync")), \
+             patch("catalog_store.os.replace",
+                   side_effect=lambda a, b: calls.append("replace") or real_replace(a, b)):
+            store.save()
+        assert calls == ["fsync", "replace", "fsync"]
+        assert CatalogStore(path).contains("h1")
+
+    def test_repeated_field_values_shared_after_load(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        store = CatalogStore(path)
+        store.add(_make_record("h1"))
+        store.add(_make_record("h2"))
+        store.save()
+        store.add(_make_record("h3"))
+        store.checkpoint()
+
+        entries = CatalogStore(path)._entries
+        for key in ("category", "extension", "date_source"):
+            assert entries["h1"][key] is entries["h2"][key] is entries["h3"][key]
+
+
+class TestStdlibJsonFallback:
+    def test_output_identical_without_orjson(self, tmp_path):
+        rec = _make_record("h1")
+        rec.source_locations = ["/src/Fotoğraf.jpg"]
+        outputs = []
+        for available in (True, False):
+            path = tmp_path / f"catalog_{available}.json"
+            with patch("catalog_store._ORJSON_AVAILABLE", available and _ORJSON_AVAILABLE), \
+                 patch("catalog_store._now_iso", return_value="2024-01-01T00:00:00"):
+                store = CatalogStore(path)
+                store.add(rec)
+                store.save()
+            outputs.append(path.read_bytes())
+        assert outputs[0] == outputs[1]
+        assert outputs[1].endswith(b"}\n")
+
+    def test_reload_without_orjson(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        store = CatalogStore(path)
+        store.add(_make_record("h1"))
+        store.save()
+        with patch("catalog_store._ORJSON_AVAILABLE", False):
+            assert CatalogStore(path).get("h1") == _make_record("h1")
+
+    def test_corrupted_json_starts_fresh_without_orjson(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        path.write_bytes(b"{ not valid \xff json")
+        with patch("catalog_store._ORJSON_AVAILABLE", False):
+            assert CatalogStore(path).record_count() == 0
+
+
+# ── checkpoint log ────────────────────────────────────────────────────────────
+
+class TestCheckpoint:
+    def test_checkpoint_appends_to_log_not_snapshot(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        store = CatalogStore(path)
+        store.add(_make_record("h1"))
+        store.checkpoint()
+        assert not path.exists()
+        assert len((tmp_path / "catalog.log").read_bytes().splitlines()) == 1
+
+    def test_only_changes_since_last_checkpoint_are_written(self, tmp_path):
+        store = CatalogStore(tmp_path / "catalog.json")
+        store.add(_make_record("h1"))
+        store.checkpoint()
+        store.checkpoint()
+        store.add(_make_record("h2"))
+        store.checkpoint()
+        assert len((tmp_path / "catalog.log").read_bytes().splitlines()) == 2
+
+    def test_checkpoint_syncs_log(self, tmp_path):
+        store = CatalogStore(tmp_path / "catalog.json")
+        store.add(_make_record("h1"))
+        with patch("catalog_store._fdatasync") as mock_sync:
+            store.checkpoint()
+            store.checkpoint()   # nothing new: no write, no sync
+        mock_sync.assert_called_once()
+
+    def test_reload_replays_log_over_snapshot(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        store = CatalogStore(path)
+        store.add(_make_record("h1"))
+        store.save()
+        store.add(_make_record("h2"))
+        store.add_location("h1", "/other/h1.jpg")
+        store.checkpoint()
+
+        store2 = CatalogStore(path)
+        assert store2.record_count() == 2
+        assert store2.get("h1").source_locations == ["/src/h1.jpg", "/other/h1.jpg"]
+        assert store2.contains_size(512)
+
+    def test_save_removes_log(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        store = CatalogStore(path)
+        store.add(_make_record("h1"))
+        store.checkpoint()
+        store.save()
+        assert not (tmp_path / "catalog.log").exists()
+        assert CatalogStore(path).record_count() == 1
+
+    def test_torn_last_line_ignored(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        store = CatalogStore(path)
+        store.add(_make_record("h1"))
+        store.checkpoint()
+        with open(tmp_path / "catalog.log", "ab") as f:
+            f.write(b'{"hash": "h2", "sourc')
+        store2 = CatalogStore(path)
+        assert store2.record_count() == 1
+        assert store2.contains("h1")
+
+
+# ── Source fingerprints ───────────────────────────────────────────────────────
+
+class TestFingerprints:
+    def test_unknown_fingerprint(self, tmp_path):
+        store = CatalogStore(tmp_path / "c.json")
+        assert store.lookup_fingerprint("1:2:3:4") is None
+
+    def test_persisted_by_save(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        store = CatalogStore(path)
+        store.add(_make_record("h1"))
+        store.add_fingerprint("1:2:3:4", "h1")
+        store.save()
+
+        assert CatalogStore(path).lookup_fingerprint("1:2:3:4") == "h1"
+        assert json.loads(path.read_text())["source_fingerprints"] == {"1:2:3:4": "h1"}
+
+    def test_save_drops_fingerprints_of_removed_entries(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        store = CatalogStore(path)
+        store.add(_make_record("h1"))
+        store.add(_make_record("h2"))
+        store.add_fingerprint("1:2:3:4", "h1")
+        store.add_fingerprint("5:6:7:8", "h2")
+        del store._entries["h2"]
+        store.save()
+
+        store2 = CatalogStore(path)
+        assert store2.lookup_fingerprint("1:2:3:4") == "h1"
+        assert store2.lookup_fingerprint("5:6:7:8") is None
+
+    def test_catalog_without_fingerprints_loads(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        entry = _make_record("h1").to_dict()
+        path.write_text(json.dumps({"version": "1.0", "entries": {"h1": entry}}))
+        store = CatalogStore(path)
+        assert store.contains("h1")
+        assert store.lookup_fingerprint("1:2:3:4") is None
+
 
 # ── add_location ──────────────────────────────────────────────────────────────
 
@@ -217,3 +380,33 @@ class TestAddLocation:
         result_locs = store.get("myhash").source_locations
         assert f"/src/myhash.jpg" in result_locs
         assert "/drive2/photo.jpg" in result_locs
+
+
+# ── contains_size ─────────────────────────────────────────────────────────────
+
+class TestContainsSize:
+    def test_false_for_empty_store(self, tmp_path):
+        store = CatalogStore(tmp_path / "c.json")
+        assert not store.contains_size(512)
+
+    def test_true_after_add(self, tmp_path):
+        store = CatalogStore(tmp_path / "c.json")
+        store.add(_make_record("h1"))
+        assert store.contains_size(512)
+        assert not store.contains_size(513)
+
+    def test_rebuilt_on_load(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        store = CatalogStore(path)
+        store.add(_make_record("h1"))
+        store.save()
+
+        store2 = CatalogStore(path)
+        assert store2.contains_size(512)
+
+    def test_entry_without_size_matches_every_size(self, tmp_path):
+        path = tmp_path / "catalog.json"
+        entry = _make_record("h1").to_dict()
+        del entry["file_size_bytes"]
+        path.write_text(json.dumps({"version": "1.0", "entries": {"h1": entry}}))
+        assert CatalogStore(path).contains_size(12345)
@@ -0,0 +1,165 @@
+"""Tests for catalog_store_sqlite.py — SQLite-backed store, JSON import, factory."""
+import sqlite3
+
+import pytest
+
+from catalog_store import CatalogStore
+from catalog_store_sqlite import SqliteCatalogStore, open_catalog_store
+from models import FileRecord
+
+
+def _make_record(hash_val: str = "abc123", size: int = 512) -> FileRecord:
+    return FileRecord(
+        hash=hash_val,
+        source_locations=[f"/src/{hash_val}.jpg"],
+        destination_path=f"/tgt/images/{hash_val}.jpg",
+        category="images",
+        extension=".jpg",
+        date_taken="2024-01-01",
+        date_source="exif",
+        file_size_bytes=size,
+        cataloged_at="2024-01-01T00:00:00",
+    )
+
+
+class TestSqliteStore:
+    def test_new_store_is_empty(self, tmp_path):
+        store = SqliteCatalogStore(tmp_path / "catalog.db")
+        assert store.record_count() == 0
+
+    def test_add_contains_get(self, tmp_path):
+        store = SqliteCatalogStore(tmp_path / "catalog.db")
+        rec = _make_record("h1")
+        store.add(rec)
+        assert store.contains("h1")
+        assert not store.contains("h2")
+        assert store.get("h1") == rec
+        assert store.get("h2") is None
+
+    def test_contains_size(self, tmp_path):
+        store = SqliteCatalogStore(tmp_path / "catalog.db")
+        store.add(_make_record("h1", size=4096))
+        assert store.contains_size(4096)
+        assert not store.contains_size(4097)
+
+    def test_get_shares_repeated_field_strings(self, tmp_path):
+        store = SqliteCatalogStore(tmp_path / "catalog.db")
+        store.add(_make_record("h1"))
+        store.add(_make_record("h2"))
+        a, b = store.get("h1"), store.get("h2")
+        assert a.category is b.category
+        assert a.extension is b.extension
+        assert a.date_source is b.date_source
+
+    def test_add_same_hash_overwrites(self, tmp_path):
+        store = SqliteCatalogStore(tmp_path / "catalog.db")
+        store.add(_make_record("dup", size=1))
+        store.add(_make_record("dup", size=2))
+        assert store.record_count() == 1
+        assert store.get("dup").file_size_bytes == 2
+
+    def test_add_location(self, tmp_path):
+        store = SqliteCatalogStore(tmp_path / "catalog.db")
+        store.add(_make_record("h1"))
+        assert store.add_location("h1", "/drive2/photo.jpg") is True
+        assert store.add_location("h1", "/drive2/photo.jpg") is False
+        assert store.add_location("missing", "/x.jpg") is False
+        assert store.get("h1").source_locations == ["/src/h1.jpg", "/drive2/photo.jpg"]
+
+    def test_save_persists_across_instances(self, tmp_path):
+        path = tmp_path / "catalog.db"
+        store = SqliteCatalogStore(path)
+        for i in range(10):
+            store.add(_make_record(f"hash_{i}"))
+        store.save()
+        store.close()
+
+        store2 = SqliteCatalogStore(path)
+        assert store2.record_count() == 10
+        assert store2.contains("hash_3")
+
+    def test_fingerprints_persist_and_prune(self, tmp_path):
+        path = tmp_path / "catalog.db"
+        store = SqliteCatalogStore(path)
+        store.add(_make_record("h1"))
+        store.add_fingerprint("1:2:3:4", "h1")
+        store.add_fingerprint("5:6:7:8", "gone")
+        store.save()
+        store.close()
+
+        store2 = SqliteCatalogStore(path)
+        assert store2.lookup_fingerprint("1:2:3:4") == "h1"
+        assert store2.lookup_fingerprint("5:6:7:8") is None
+
+    def test_checkpoint_commits_without_pruning(self, tmp_path):
+        path = tmp_path / "catalog.db"
+        store = SqliteCatalogStore(path)
+        store.add(_make_record("h1"))
+        store.add_fingerprint("5:6:7:8", "gone")
+        store.checkpoint()
+
+        conn = sqlite3.connect(str(path))
+        assert conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM source_fingerprints").fetchone()[0] == 1
+        conn.close()
+        store.close()
+
+    def test_close_commits_and_removes_wal(self, tmp_path):
+        path = tmp_path / "catalog.db"
+        store = SqliteCatalogStore(path)
+        store.add(_make_record("h1"))
+        store.close()
+        assert not (tmp_path / "catalog.db-wal").exists()
+        assert SqliteCatalogStore(path).contains("h1")
+
+    def test_uses_wal_journal(self, tmp_path):
+        path = tmp_path / "catalog.db"
+        SqliteCatalogStore(path).close()
+        conn = sqlite3.connect(str(path))
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+
+class TestJsonImport:
+    def test_imports_json_catalog_once(self, tmp_path):
+        json_path = tmp_path / "media_catalog.json"
+        legacy = CatalogStore(json_path)
+        legacy.add(_make_record("h1"))
+        legacy.add(_make_record("h2"))
+        legacy.save()
+
+        store = SqliteCatalogStore(tmp_path / "media_catalog.db", json_import_path=json_path)
+        assert store.record_count() == 2
+        assert store.get("h1") == _make_record("h1")
+
+    def test_imports_fingerprints(self, tmp_path):
+        json_path = tmp_path / "media_catalog.json"
+        legacy = CatalogStore(json_path)
+        legacy.add(_make_record("h1"))
+        legacy.add_fingerprint("1:2:3:4", "h1")
+        legacy.save()
+
+        store = SqliteCatalogStore(tmp_path / "media_catalog.db", json_import_path=json_path)
+        assert store.lookup_fingerprint("1:2:3:4") == "h1"
+
+    def test_missing_json_is_ignored(self, tmp_path):
+        store = SqliteCatalogStore(
+            tmp_path / "media_catalog.db",
+            json_import_path=tmp_path / "media_catalog.json",
+        )
+        assert store.record_count() == 0
+
+
+class TestOpenCatalogStore:
+    def test_json_path_opens_json_store(self, tmp_path):
+        assert isinstance(open_catalog_store(tmp_path / "c.json"), CatalogStore)
+
+    @pytest.mark.parametrize("name", ["c.db", "c.sqlite", "c.SQLITE3"])
+    def test_sqlite_suffix_opens_sqlite_store(self, tmp_path, name):
+        assert isinstance(open_catalog_store(tmp_path / name), SqliteCatalogStore)
+
+    def test_dry_run_does_not_create_database(self, tmp_path):
+        path = tmp_path / "target" / "c.db"
+        open_catalog_store(path, dry_run=True)
+        assert not path.exists()
+        assert not path.parent.exists()
@@ -3,7 +3,9 @@ from pathlib import Path
 
 import pytest
 
-from categories import ALL_CATEGORIES, CATEGORY_MAP, CATEGORY_OTHERS, categorize_file
+from categories import (
+    ALL_CATEGORIES, CATEGORY_MAP, CATEGORY_OTHERS, categorize_file, categorize_name,
+)
 
 
 class TestCategoryMap:
@@ -103,3 +105,12 @@ class TestCaseInsensitivity:
 
     def test_all_caps_extension(self, tmp_path):
         assert categorize_file(tmp_path / "RAW.CR2") == "images"
+
+
+class TestCategorizeName:
+    @pytest.mark.parametrize("name", [
+        "photo.jpg", "clip.MP4", "archive.tar.gz", "README", "photo.",
+        ".jpg", "..jpg", "a.b.Pdf", "song.mp3",
+    ])
+    def test_matches_categorize_file(self, name):
+        assert categorize_name(name) == categorize_file(Path(name))
@@ -1,6 +1,7 @@
 """Tests for copier.py — path building, collision resolution, file copying,
 and timestamp preservation."""
 import calendar
+import errno
 import os
 import platform
 from pathlib import Path
@@ -8,7 +9,10 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from copier import build_destination_path, copy_file, preserve_timestamps, resolve_collision
+from copier import (
+    _SENDFILE_TO_FILE, build_destination_path, copy_file, copy_file_hashed,
+    preserve_timestamps, resolve_collision,
+)
 from tests.conftest import make_file
 
 # 2001-01-01 00:00:00 UTC — a known null/sentinel timestamp
@@ -89,6 +93,41 @@ class TestResolveCollision:
         assert not p.exists()
         assert resolve_collision(p) == p
 
+    def test_directory_listed_once_for_repeated_collisions(self, tmp_path):
+        for name in ["photo.jpg", "photo_2.jpg", "photo_3.jpg"]:
+            make_file(tmp_path / name)
+        real_listdir = os.listdir
+        with patch("copier.os.listdir", side_effect=real_listdir) as mock_listdir:
+            first = resolve_collision(tmp_path / "photo.jpg")
+            make_file(first)
+            second = resolve_collision(tmp_path / "photo.jpg")
+        assert first == tmp_path / "photo_4.jpg"
+        assert second == tmp_path / "photo_5.jpg"
+        assert mock_listdir.call_count == 1
+
+    def test_file_created_after_listing_not_clobbered(self, tmp_path):
+        make_file(tmp_path / "clip.mp4")
+        make_file(tmp_path / "clip_2.mp4")
+        assert resolve_collision(tmp_path / "clip.mp4") == tmp_path / "clip_3.mp4"
+        # Appears on disk without going through resolve_collision
+        make_file(tmp_path / "clip_3.mp4")
+        assert resolve_collision(tmp_path / "clip.mp4") == tmp_path / "clip_4.mp4"
+
+    def test_name_never_created_is_handed_out_again(self, tmp_path):
+        make_file(tmp_path / "clip.mp4")
+        assert resolve_collision(tmp_path / "clip.mp4") == tmp_path / "clip_2.mp4"
+        assert resolve_collision(tmp_path / "clip.mp4") == tmp_path / "clip_2.mp4"
+
+    def test_failed_copy_leaves_no_gap(self, tmp_path):
+        make_file(tmp_path / "out" / "photo.jpg", b"existing")
+        src = make_file(tmp_path / "photo.jpg", b"new")
+        dest = tmp_path / "out" / "photo.jpg"
+        with patch("copier._copy_data", side_effect=OSError(errno.ENOSPC, "disk full")):
+            with pytest.raises(OSError):
+                copy_file(src, dest)
+        assert copy_file(src, dest) == tmp_path / "out" / "photo_2.jpg"
+        assert copy_file(src, dest) == tmp_path / "out" / "photo_3.jpg"
+
 
 # ── copy_file ─────────────────────────────────────────────────────────────────
 
@@ -132,6 +171,93 @@ class TestCopyFile:
         copy_file(src, dest)
         assert dest.read_bytes() == data
 
+    def test_falls_back_when_copy_file_range_unsupported(self, tmp_path):
+        data = b"fallback " * 1000
+        src = make_file(tmp_path / "photo.jpg", data)
+        dest = tmp_path / "out" / "photo.jpg"
+        err = OSError(errno.EXDEV, "cross-device")
+        with patch("copier.os.copy_file_range", side_effect=err, create=True):
+            copy_file(src, dest)
+        assert dest.read_bytes() == data
+
+    def test_falls_back_when_copy_file_range_copies_nothing(self, tmp_path):
+        data = b"zero-return " * 1000
+        src = make_file(tmp_path / "photo.jpg", data)
+        dest = tmp_path / "out" / "photo.jpg"
+        with patch("copier.os.copy_file_range", return_value=0, create=True):
+            copy_file(src, dest)
+        assert dest.read_bytes() == data
+
+    @pytest.mark.skipif(not _SENDFILE_TO_FILE, reason="sendfile to a file is Linux-only")
+    def test_sendfile_used_when_copy_file_range_unsupported(self, tmp_path):
+        data = b"sendfile " * 50_000
+        src = make_file(tmp_path / "clip.mp4", data)
+        dest = tmp_path / "out" / "clip.mp4"
+        err = OSError(errno.EXDEV, "cross-device")
+        with patch("copier.os.copy_file_range", side_effect=err, create=True), \
+             patch("copier.os.sendfile", side_effect=os.sendfile) as mock_sendfile:
+            copy_file(src, dest)
+        assert mock_sendfile.called
+        assert dest.read_bytes() == data
+
+    def test_userspace_copy_when_kernel_copies_unsupported(self, tmp_path):
+        data = b"userspace " * 1000
+        src = make_file(tmp_path / "photo.jpg", data)
+        dest = tmp_path / "out" / "photo.jpg"
+        err = OSError(errno.EINVAL, "invalid argument")
+        with patch("copier.os.copy_file_range", side_effect=err, create=True), \
+             patch("copier.os.sendfile", side_effect=err, create=True):
+            copy_file(src, dest)
+        assert dest.read_bytes() == data
+
+    def test_copy_file_hashed_returns_digest(self, tmp_path):
+        import hashlib
+        data = b"h" * (3 * 1024 * 1024 + 5)
+        src = make_file(tmp_path / "clip.mp4", data)
+        os.utime(src, (1_700_000_000.0, 1_700_000_000.0))
+        dest, digest = copy_file_hashed(src, tmp_path / "out" / "clip.mp4", hashlib.sha256)
+        assert digest == hashlib.sha256(data).hexdigest()
+        assert dest.read_bytes() == data
+        assert abs(dest.stat().st_mtime - 1_700_000_000.0) < 2
+
+    def test_copy_file_hashed_resolves_collision(self, tmp_path):
+        import hashlib
+        make_file(tmp_path / "out" / "photo.jpg", b"existing")
+        src = make_file(tmp_path / "photo.jpg", b"new")
+        dest, _ = copy_file_hashed(src, tmp_path / "out" / "photo.jpg", hashlib.md5)
+        assert dest.name == "photo_2.jpg"
+        assert (tmp_path / "out" / "photo.jpg").read_bytes() == b"existing"
+
+    @pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="no posix_fadvise")
+    def test_large_source_pages_dropped_after_copy(self, tmp_path):
+        src = make_file(tmp_path / "clip.mp4", b"v" * 4096)
+        with patch("copier.DROP_CACHE_MIN_SIZE", 1024), \
+             patch("copier.os.posix_fadvise") as mock_advise:
+            copy_file(src, tmp_path / "out" / "clip.mp4")
+        assert mock_advise.call_args.args[3] == os.POSIX_FADV_DONTNEED
+
+    @pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="no posix_fadvise")
+    def test_small_source_pages_kept(self, tmp_path):
+        src = make_file(tmp_path / "photo.jpg", b"small")
+        with patch("copier.os.posix_fadvise") as mock_advise:
+            copy_file(src, tmp_path / "out" / "photo.jpg")
+        assert all(c.args[3] != os.POSIX_FADV_DONTNEED for c in mock_advise.call_args_list)
+
+    def test_partial_copy_removed_on_error(self, tmp_path):
+        src = make_file(tmp_path / "photo.jpg", b"data")
+        dest = tmp_path / "out" / "photo.jpg"
+        with patch("copier.os.copy_file_range", side_effect=OSError(errno.EIO, "I/O error"),
+                   create=True):
+            with pytest.raises(OSError):
+                copy_file(src, dest)
+        assert not dest.exists()
+
+    def test_copies_permission_bits(self, tmp_path):
+        src = make_file(tmp_path / "photo.jpg", b"data")
+        os.chmod(src, 0o640)
+        dest = copy_file(src, tmp_path / "out" / "photo.jpg")
+        assert (dest.stat().st_mode & 0o777) == 0o640
+
     def test_mtime_preserved_after_copy(self, tmp_path):
         src = make_file(tmp_path / "photo.jpg", b"data")
         os.utime(src, (1_700_000_000.0, 1_700_000_000.0))
@@ -95,6 +95,54 @@ class TestDirectoryPatterns:
         assert not ex.should_skip_dir(Path("photos"))
 
 
+class TestCombinedPatterns:
+    def test_any_of_several_name_patterns_matches(self):
+        ex = Excludes(["dqhelper", "tmp*", "Cache"])
+        assert ex.should_skip_dir(Path("a/dqhelper"))
+        assert ex.should_skip_dir(Path("tmpfiles/b"))
+        assert ex.should_skip_dir(Path("Cache"))
+        assert not ex.should_skip_dir(Path("photos/2024"))
+
+    def test_name_and_slash_patterns_together(self):
+        ex = Excludes(["dqhelper", "logs/archive"])
+        assert ex.should_skip_dir(Path("logs/archive"))
+        assert ex.should_skip_dir(Path("x/dqhelper"))
+        assert not ex.should_skip_dir(Path("logs"))
+
+    def test_wildcard_slash_pattern(self):
+        ex = Excludes(["DCIM/*_TMP"])
+        assert ex.should_skip_dir(Path("DCIM/100_TMP"))
+        assert not ex.should_skip_dir(Path("DCIM/100MEDIA"))
+
+    def test_file_name_pattern_is_anchored(self):
+        ex = Excludes(["junk"])
+        assert ex.should_skip_file(Path("junk"))
+        assert not ex.should_skip_file(Path("junkyard"))
+        assert not ex.should_skip_file(Path("oldjunk"))
+
+    def test_current_dir_never_skipped(self):
+        ex = Excludes(["*"])
+        assert not ex.should_skip_dir(Path("."))
+
+
+class TestShouldSkipChild:
+    @pytest.mark.parametrize("rel", [
+        "logs/archive", "logs/new", "x/dqhelper", "dqhelper", "photos/2024",
+        "DCIM/100_TMP", "DCIM/100MEDIA", "a/b/c.jpg",
+    ])
+    def test_agrees_with_should_skip_dir_below_kept_parent(self, rel):
+        ex = Excludes(["dqhelper", "logs/archive", "DCIM/*_TMP"])
+        path = Path(rel)
+        assert not ex.should_skip_dir(path.parent)
+        assert ex.should_skip_child(path.name, rel) == ex.should_skip_dir(path)
+
+    def test_only_final_component_matched_by_name(self):
+        ex = Excludes(["dqhelper"])
+        # The parent would have been pruned; the child check does not repeat it
+        assert not ex.should_skip_child("photo.jpg", "dqhelper/photo.jpg")
+        assert ex.should_skip_child("dqhelper", "a/dqhelper")
+
+
 class TestDescribe:
     def test_empty_returns_none_string(self):
         assert Excludes([]).describe() == "none"
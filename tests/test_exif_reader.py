@@ -1,5 +1,6 @@
 """Tests for exif_reader.py — date parsing, filesystem fallback, get_media_date."""
 import os
+import struct
 import time
 from datetime import datetime
 from pathlib import Path
@@ -9,6 +10,7 @@ import pytest
 
 from exif_reader import (
     _EXIF_CAPABLE,
+    _EXIFREAD_AVAILABLE,
     _is_null_timestamp,
     _parse_exif_date,
     get_date_from_exif,
@@ -18,6 +20,20 @@ from exif_reader import (
 from tests.conftest import make_file
 
 
+def _jpeg_with_exif_dates(original: bytes, digitized: bytes) -> bytes:
+    """Minimal JPEG whose EXIF IFD holds DateTimeOriginal and DateTimeDigitized."""
+    exif_ifd = 8 + 2 + 12 + 4           # after the header and a one-entry IFD0
+    values = exif_ifd + 2 + 2 * 12 + 4  # after the two-entry EXIF IFD
+    tiff = b"II*\x00" + struct.pack("<I", 8)
+    tiff += struct.pack("<H", 1) + struct.pack("<HHII", 0x8769, 4, 1, exif_ifd) + bytes(4)
+    tiff += struct.pack("<H", 2)
+    tiff += struct.pack("<HHII", 0x9003, 2, 20, values)
+    tiff += struct.pack("<HHII", 0x9004, 2, 20, values + 20)
+    tiff += bytes(4) + original + b"\0" + digitized + b"\0"
+    app1 = b"Exif\0\0" + tiff
+    return b"\xff\xd8\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1 + b"\xff\xd9"
+
+
 # ── _parse_exif_date ──────────────────────────────────────────────────────────
 
 class TestParseExifDate:
@@ -41,6 +57,21 @@ class TestParseExifDate:
         assert _parse_exif_date("2024/03/15") is None
         assert _parse_exif_date("") is None
 
+    def test_impossible_calendar_date_returns_none(self):
+        assert _parse_exif_date("2023:02:29 10:00:00") is None
+        assert _parse_exif_date("2024:03:15 24:00:00") is None
+
+    @pytest.mark.parametrize("raw", [
+        "2024:3:5 1:2:3", "2024:03:15  10:30:00", "2024:03:15 10:30",
+        "2024:03:15T10:30:00", "2024:03:15 10:30:00 +02:00", "24:03:15 10:30:00",
+    ])
+    def test_accepts_what_strptime_accepts(self, raw):
+        try:
+            expected = datetime.strptime(raw, "%Y:%m:%d %H:%M:%S")
+        except ValueError:
+            expected = None
+        assert _parse_exif_date(raw) == expected
+
     def test_zero_month_returns_none(self):
         assert _parse_exif_date("2024:00:15 10:00:00") is None
 
@@ -140,6 +171,15 @@ class TestGetDateFromFs:
         after = datetime.now()
         assert before <= dt <= after
 
+    def test_uses_given_stat_without_restat(self, tmp_path):
+        f = make_file(tmp_path / "photo.jpg")
+        st = MagicMock(spec=["st_ctime", "st_mtime"])
+        st.st_ctime = st.st_mtime = datetime(2019, 5, 6, 7, 8, 9).timestamp()
+        with patch.object(Path, "stat", side_effect=AssertionError("re-stat")):
+            dt, label = get_date_from_fs(f, st)
+        assert dt == datetime(2019, 5, 6, 7, 8, 9)
+        assert label in ("ctime", "mtime")
+
     def test_null_mtime_falls_back_to_import_time(self, tmp_path):
         """If every filesystem timestamp is a sentinel, return current time."""
         f = make_file(tmp_path / "photo.jpg")
@@ -266,6 +306,44 @@ class TestGetDateFromExif:
             dt, source = get_date_from_exif(f)
         assert dt is None
 
+    def test_image_parsed_once_with_stop_tag(self, tmp_path):
+        f = make_file(tmp_path / "photo.jpg", b"fake jpeg")
+        with patch("exif_reader._EXIFREAD_AVAILABLE", True), \
+             patch("exif_reader.exifread.process_file", return_value={}) as mock_proc:
+            dt, _ = get_date_from_exif(f)
+        assert dt is None
+        assert mock_proc.call_count == 1
+        assert mock_proc.call_args.kwargs["stop_tag"] == "DateTimeOriginal"
+
+    @pytest.mark.skipif(not _EXIFREAD_AVAILABLE, reason="exifread not installed")
+    def test_invalid_original_falls_back_to_digitized(self, tmp_path):
+        f = tmp_path / "photo.jpg"
+        f.write_bytes(_jpeg_with_exif_dates(b"0000:00:00 00:00:00", b"2021:05:06 07:08:09"))
+        assert get_date_from_exif(f) == (datetime(2021, 5, 6, 7, 8, 9), "exif")
+
+    @pytest.mark.skipif(not _EXIFREAD_AVAILABLE, reason="exifread not installed")
+    def test_valid_original_parsed_once(self, tmp_path):
+        f = tmp_path / "photo.jpg"
+        f.write_bytes(_jpeg_with_exif_dates(b"2020:01:02 03:04:05", b"2021:05:06 07:08:09"))
+        import exifread
+        with patch("exif_reader.exifread.process_file",
+                   side_effect=exifread.process_file) as mock_proc:
+            assert get_date_from_exif(f) == (datetime(2020, 1, 2, 3, 4, 5), "exif")
+        assert mock_proc.call_count == 1
+
+    def test_video_parsed_once_without_stop_tag(self, tmp_path):
+        f = make_file(tmp_path / "clip.mov", b"fake mov")
+        tag_mock = MagicMock()
+        tag_mock.__str__ = lambda self: "2022:05:05 12:00:00"
+        fake_tags = {"QuickTime Creation Date": tag_mock}
+        with patch("exif_reader._EXIFREAD_AVAILABLE", True), \
+             patch("exif_reader.exifread.process_file", return_value=fake_tags) as mock_proc:
+            dt, source = get_date_from_exif(f)
+        assert dt == datetime(2022, 5, 5, 12, 0, 0)
+        assert source == "exif"
+        assert mock_proc.call_count == 1
+        assert "stop_tag" not in mock_proc.call_args.kwargs
+
     # ── EXIF-capable whitelist ─────────────────────────────────────────────────
 
     @pytest.mark.parametrize("ext", [".mpg", ".mpeg", ".mpv", ".m2v", ".avi",
@@ -315,6 +393,13 @@ class TestGetMediaDate:
         assert dt == datetime(2020, 1, 1)
         assert source == "exif"
 
+    def test_passes_stat_to_fs_fallback(self, tmp_path):
+        f = make_file(tmp_path / "notes.txt", b"no exif")
+        st = f.stat()
+        with patch("exif_reader.get_date_from_fs", return_value=(datetime(2020, 1, 1), "mtime")) as mock_fs:
+            get_media_date(f, st)
+        mock_fs.assert_called_once_with(f, st)
+
     def test_always_returns_valid_datetime(self, tmp_path):
         f = make_file(tmp_path / "video.mp4", b"fake")
         dt, source = get_media_date(f)
@@ -1,9 +1,22 @@
 """Tests for hasher.py — SHA-256, MD5, dispatch."""
 import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 import pytest
 
-from hasher import compute_hash, compute_md5, compute_sha256
+import hasher
+from hasher import (
+    _BLAKE3_AVAILABLE,
+    compute_blake3,
+    compute_hash,
+    compute_md5,
+    compute_sha256,
+    compute_sha256_tree,
+    hash_factory,
+)
 from tests.conftest import make_file
 
 
@@ -35,12 +48,50 @@ class TestComputeSha256:
             compute_sha256(tmp_path / "nonexistent.bin")
 
     def test_large_content_chunked_correctly(self, tmp_path):
-        # 200 KB — forces multiple 64 KB chunk reads
-        data = b"x" * (200 * 1024)
+        # Over 1 MB: several reads of file_digest's 256 KB buffer and of
+        # the 1 MB CHUNK_SIZE fallback, well above SMALL_FILE_SIZE
+        data = b"x" * (2 * 1024 * 1024 + 17)
         f = make_file(tmp_path / "large.bin", data)
         expected = hashlib.sha256(data).hexdigest()
         assert compute_sha256(f) == expected
 
+    def test_chunked_fallback_without_file_digest(self, tmp_path):
+        # Interpreters older than 3.11 have no hashlib.file_digest
+        data = b"y" * (2 * 1024 * 1024 + 17)   # spans several 1 MB chunks
+        f = make_file(tmp_path / "large.bin", data)
+        with patch("hasher._file_digest", None):
+            assert compute_sha256(f) == hashlib.sha256(data).hexdigest()
+
+    def test_small_file_read_in_one_call(self, tmp_path):
+        data = b"small" * 1000
+        f = make_file(tmp_path / "small.bin", data)
+        with patch("hasher._file_digest", side_effect=AssertionError("looped")), \
+             patch("hasher.os.posix_fadvise", create=True) as mock_advise:
+            assert compute_sha256(f) == hashlib.sha256(data).hexdigest()
+        mock_advise.assert_not_called()
+
+    def test_fallback_buffer_reused_per_thread(self, tmp_path):
+        f = make_file(tmp_path / "large.bin", b"z" * (300 * 1024))
+        with patch("hasher._file_digest", None):
+            compute_sha256(f)
+            buf = hasher._local.buf
+            compute_sha256(f)
+            assert hasher._local.buf is buf
+
+    @pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="no posix_fadvise")
+    def test_sequential_access_advised(self, tmp_path):
+        f = make_file(tmp_path / "f.bin", b"data" * 100_000)
+        with patch("hasher.os.posix_fadvise") as mock_advise:
+            compute_sha256(f)
+        mock_advise.assert_called_once()
+
+    @pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="no posix_fadvise")
+    def test_fadvise_failure_is_ignored(self, tmp_path):
+        data = b"advice rejected" * 20_000
+        f = make_file(tmp_path / "f.bin", data)
+        with patch("hasher.os.posix_fadvise", side_effect=OSError("ESPIPE")):
+            assert compute_sha256(f) == hashlib.sha256(data).hexdigest()
+
 
 class TestComputeMd5:
     def test_known_content(self, tmp_path):
@@ -54,6 +105,102 @@ class TestComputeMd5:
             compute_md5(tmp_path / "gone.bin")
 
 
+@pytest.mark.skipif(not _BLAKE3_AVAILABLE, reason="blake3 package not installed")
+class TestComputeBlake3:
+    def test_known_content(self, tmp_path):
+        import blake3
+        data = b"hello blake3"
+        f = make_file(tmp_path / "test.bin", data)
+        assert compute_blake3(f) == blake3.blake3(data).hexdigest()
+
+    def test_large_file_threaded_same_digest(self, tmp_path):
+        import blake3
+        data = os.urandom(100_000)
+        f = make_file(tmp_path / "big.bin", data)
+        with patch("hasher.BLAKE3_THREADED_MIN_SIZE", 1024), \
+             patch("hasher.BLAKE3_THREADED_BUFSIZE", 4096):
+            assert compute_blake3(f) == blake3.blake3(data).hexdigest()
+
+    def test_dispatches_to_blake3(self, tmp_path):
+        import blake3
+        data = b"blake3 dispatch"
+        f = make_file(tmp_path / "f.bin", data)
+        assert compute_hash(f, algo="blake3") == blake3.blake3(data).hexdigest()
+
+
+class TestComputeSha256Tree:
+    def test_small_file_is_plain_sha256(self, tmp_path):
+        data = b"below the tree threshold"
+        f = make_file(tmp_path / "f.bin", data)
+        assert compute_sha256_tree(f) == hashlib.sha256(data).hexdigest()
+
+    def test_large_file_hashes_leaves_then_root(self, tmp_path):
+        data = b"abcdefghij" * 5   # 50 bytes → leaves of 16, 16, 16, 2
+        f = make_file(tmp_path / "f.bin", data)
+        leaves = b"".join(
+            hashlib.sha256(b"\x00" + data[i:i + 16]).digest() for i in range(0, 50, 16)
+        )
+        expected = hashlib.sha256(b"\x01" + (16).to_bytes(8, "big") + leaves).hexdigest()
+        with patch("hasher.TREE_MIN_SIZE", 32), patch("hasher.TREE_CHUNK_SIZE", 16):
+            assert compute_sha256_tree(f) == "tree:" + expected
+
+    def test_same_content_same_tree_hash(self, tmp_path):
+        a = make_file(tmp_path / "a.bin", os.urandom(100))
+        b = make_file(tmp_path / "b.bin", a.read_bytes())
+        with patch("hasher.TREE_MIN_SIZE", 32), patch("hasher.TREE_CHUNK_SIZE", 16):
+            assert compute_sha256_tree(a) == compute_sha256_tree(b)
+
+    def test_missing_file_raises_oserror(self, tmp_path):
+        with pytest.raises(OSError):
+            compute_sha256_tree(tmp_path / "missing.bin")
+
+    def test_short_reads_are_completed(self, tmp_path):
+        data = os.urandom(100)
+        f = make_file(tmp_path / "f.bin", data)
+        real_pread = os.pread
+        with patch("hasher.TREE_MIN_SIZE", 32), patch("hasher.TREE_CHUNK_SIZE", 16):
+            expected = compute_sha256_tree(f)
+            with patch("hasher.os.pread",
+                       side_effect=lambda fd, n, off: real_pread(fd, min(n, 5), off)):
+                assert compute_sha256_tree(f) == expected
+
+    def test_sequential_without_pread_same_digest(self, tmp_path):
+        f = make_file(tmp_path / "f.bin", os.urandom(100))
+        with patch("hasher.TREE_MIN_SIZE", 32), patch("hasher.TREE_CHUNK_SIZE", 16):
+            expected = compute_sha256_tree(f)
+            with patch("hasher._HAS_PREAD", False):
+                assert compute_sha256_tree(f) == expected
+
+    def test_no_reads_after_a_leaf_fails(self, tmp_path):
+        f = make_file(tmp_path / "f.bin", os.urandom(16 * 20))
+        calls = []
+        real_pread = os.pread
+
+        def failing_pread(fd, n, offset):
+            calls.append(offset)
+            if offset == 0:
+                raise OSError("EIO")
+            time.sleep(0.001)
+            return real_pread(fd, n, offset)
+
+        with ThreadPoolExecutor(max_workers=2) as pool, \
+             patch("hasher._tree_pool", pool), \
+             patch("hasher.TREE_MIN_SIZE", 32), patch("hasher.TREE_CHUNK_SIZE", 16), \
+             patch("hasher.os.pread", side_effect=failing_pread):
+            with pytest.raises(OSError):
+                compute_sha256_tree(f)
+            reads = len(calls)
+            time.sleep(0.05)
+            assert len(calls) == reads
+
+    def test_dispatch_and_no_incremental_factory(self, tmp_path):
+        data = b"tree dispatch"
+        f = make_file(tmp_path / "f.bin", data)
+        assert compute_hash(f, algo="sha256-tree") == hashlib.sha256(data).hexdigest()
+        with pytest.raises(ValueError):
+            hash_factory("sha256-tree")
+
+
 class TestComputeHash:
     def test_dispatches_to_sha256_by_default(self, tmp_path):
         data = b"dispatch test"
@@ -74,3 +221,9 @@ class TestComputeHash:
         data = b"same content"
         f = make_file(tmp_path / "f.bin", data)
         assert compute_hash(f, algo="sha256") != compute_hash(f, algo="md5")
+
+    def test_blake3_unavailable_raises(self, tmp_path):
+        f = make_file(tmp_path / "f.bin", b"data")
+        with patch("hasher._BLAKE3_AVAILABLE", False):
+            with pytest.raises(RuntimeError):
+                compute_hash(f, algo="blake3")
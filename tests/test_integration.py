@@ -2,13 +2,20 @@
 Integration tests — end-to-end pipeline via process_source and the full
 catalog machinery.  No CLI parsing is exercised here.
 """
+import hashlib
+import os
+import threading
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from catalog import process_source
+import copier
+import hasher
+from catalog import _size_and_hash, process_source
 from catalog_store import CatalogStore
+from catalog_store_sqlite import SqliteCatalogStore
 from excludes import Excludes
 from tests.conftest import make_file
 
@@ -22,6 +29,7 @@ def _run(
     excludes: Excludes = None,
     dry_run: bool = False,
     verbose: bool = False,
+    workers: int = 1,
 ):
     """Run process_source with a fresh catalog and return (summary, store)."""
     catalog_path = tgt / "media_catalog.json"
@@ -34,6 +42,7 @@ def _run(
         dry_run=dry_run,
         verbose=verbose,
         excludes=excludes or Excludes([]),
+        workers=workers,
     )
     return summary, store
 
@@ -114,6 +123,15 @@ class TestBasicCopy:
         assert summary.files_scanned == 3
         assert summary.files_copied == 3
 
+    def test_record_date_taken_is_iso_date(self, src, tgt):
+        make_file(src / "photo.jpg", b"dated content")
+        with patch("catalog.get_media_date",
+                   return_value=(datetime(2021, 2, 3, 4, 5, 6), "exif")):
+            _, store = _run(src, tgt)
+
+        rec = store.get(hashlib.sha256(b"dated content").hexdigest())
+        assert rec.date_taken == "2021-02-03"
+
 
 # ── Duplicate detection ───────────────────────────────────────────────────────
 
@@ -184,6 +202,57 @@ class TestDuplicateDetection:
                              dry_run=False, verbose=False, excludes=Excludes([]))
         assert s2.files_skipped == 1
 
+    def test_second_run_skips_all_with_sqlite_catalog(self, src, tgt):
+        make_file(src / "photo.jpg", b"same data")
+        make_file(src / "clip.mp4", b"same video")
+        catalog_path = tgt / "media_catalog.db"
+
+        store = SqliteCatalogStore(catalog_path)
+        s1 = process_source(src, tgt, store=store, hash_algo="sha256",
+                            dry_run=False, verbose=False, excludes=Excludes([]))
+        store.close()
+        assert s1.files_copied == 2
+
+        store2 = SqliteCatalogStore(catalog_path)
+        s2 = process_source(src, tgt, store=store2, hash_algo="sha256",
+                            dry_run=False, verbose=False, excludes=Excludes([]))
+        store2.close()
+        assert s2.files_copied == 0
+        assert s2.files_skipped == 2
+
+    def test_second_run_reads_no_unchanged_file(self, src, tgt):
+        make_file(src / "photo.jpg", b"same data")
+        make_file(src / "clip.mp4", b"same video")
+        catalog_path = tgt / "media_catalog.json"
+
+        store = CatalogStore(catalog_path)
+        process_source(src, tgt, store=store, hash_algo="sha256",
+                       dry_run=False, verbose=False, excludes=Excludes([]))
+        store.save()
+
+        store2 = CatalogStore(catalog_path)
+        with patch("catalog.compute_hash", side_effect=AssertionError("re-hashed")):
+            s2 = process_source(src, tgt, store=store2, hash_algo="sha256",
+                                dry_run=False, verbose=False, excludes=Excludes([]))
+        assert s2.files_skipped == 2
+
+    def test_modified_file_is_hashed_again(self, src, tgt):
+        photo = make_file(src / "photo.jpg", b"original")
+        catalog_path = tgt / "media_catalog.json"
+
+        store = CatalogStore(catalog_path)
+        process_source(src, tgt, store=store, hash_algo="sha256",
+                       dry_run=False, verbose=False, excludes=Excludes([]))
+        store.save()
+
+        photo.write_bytes(b"edited!!")   # same size
+        os.utime(photo, ns=(0, photo.stat().st_mtime_ns + 1_000_000_000))
+        store2 = CatalogStore(catalog_path)
+        s2 = process_source(src, tgt, store=store2, hash_algo="sha256",
+                            dry_run=False, verbose=False, excludes=Excludes([]))
+        assert s2.files_copied == 1
+        assert store2.record_count() == 2
+
 
 # ── Dry run ───────────────────────────────────────────────────────────────────
 
@@ -198,6 +267,24 @@ class TestDryRun:
         _, store = _run(src, tgt, dry_run=True)
         assert store.record_count() == 0
 
+    def test_unique_size_not_hashed_in_dry_run(self, src, tgt):
+        make_file(src / "photo.jpg", b"data")
+        with patch("catalog.compute_hash") as mock_hash:
+            summary, _ = _run(src, tgt, dry_run=True)
+        mock_hash.assert_not_called()
+        assert summary.files_copied == 1
+
+    def test_known_size_still_hashed_in_dry_run(self, src, tgt):
+        make_file(src / "photo.jpg", b"data")
+        _run(src, tgt)
+
+        store = CatalogStore(tgt / "media_catalog.json")
+        summary = process_source(src, tgt, store=store, hash_algo="sha256",
+                                 dry_run=True, verbose=False,
+                                 excludes=Excludes([]))
+        assert summary.files_skipped == 1
+        assert summary.files_copied == 0
+
     def test_counts_correct_in_dry_run(self, src, tgt):
         make_file(src / "a.jpg", b"1")
         make_file(src / "b.mp4", b"2")
@@ -206,6 +293,53 @@ class TestDryRun:
         assert summary.files_copied == 2   # "would copy"
 
 
+# ── Hash while copying (source on another filesystem) ────────────────────────
+
+class TestFusedHashCopy:
+    def test_unique_size_hashed_during_copy(self, src, tgt):
+        make_file(src / "photo.jpg", b"cross-device bytes")
+        with patch("catalog._on_other_device", return_value=True), \
+             patch("catalog.compute_hash") as mock_hash:
+            summary, store = _run(src, tgt)
+        mock_hash.assert_not_called()
+        assert summary.files_copied == 1
+        rec = store.get(hashlib.sha256(b"cross-device bytes").hexdigest())
+        assert rec is not None
+        assert Path(rec.destination_path).read_bytes() == b"cross-device bytes"
+
+    def test_duplicates_within_run_still_detected(self, src, tgt):
+        for i in range(5):
+            make_file(src / f"copy{i}.jpg", b"same bytes")
+        make_file(src / "other.jpg", b"diff bytes")   # same size, new content
+        with patch("catalog._on_other_device", return_value=True):
+            summary, store = _run(src, tgt, workers=4)
+        assert summary.files_copied == 2
+        assert summary.files_skipped == 4
+        assert store.record_count() == 2
+
+    def test_known_size_hashed_before_copy(self, src, tgt):
+        make_file(src / "a.jpg", b"12345")
+        _run(src, tgt)
+        make_file(src / "b.jpg", b"54321")
+        store = CatalogStore(tgt / "media_catalog.json")
+        with patch("catalog._on_other_device", return_value=True), \
+             patch("catalog.copy_file_hashed") as mock_fused:
+            summary = process_source(src, tgt, store=store, hash_algo="sha256",
+                                     dry_run=False, verbose=False,
+                                     excludes=Excludes([]))
+        mock_fused.assert_not_called()
+        assert summary.files_skipped == 1
+        assert summary.files_copied == 1
+
+    def test_same_device_keeps_fast_copy(self, src, tgt):
+        make_file(src / "photo.jpg", b"same device")
+        with patch("catalog._on_other_device", return_value=False), \
+             patch("catalog.copy_file_hashed") as mock_fused:
+            summary, _ = _run(src, tgt)
+        mock_fused.assert_not_called()
+        assert summary.files_copied == 1
+
+
 # ── Excludes ──────────────────────────────────────────────────────────────────
 
 class TestExcludesIntegration:
@@ -233,6 +367,104 @@ class TestExcludesIntegration:
         assert summary.files_copied == 3
 
 
+# ── Pre-scanned file lists ────────────────────────────────────────────────────
+
+class TestPrescannedFiles:
+    def test_uses_given_files_without_rescanning(self, src, tgt):
+        from scanner import scan_directory
+        make_file(src / "a.jpg", b"1")
+        make_file(src / "b.mp4", b"2")
+        files = list(scan_directory(src))
+
+        store = CatalogStore(tgt / "media_catalog.json")
+        with patch("catalog.scan_directory_with_stat") as mock_scan:
+            summary = process_source(src, tgt, store=store, hash_algo="sha256",
+                                     dry_run=False, verbose=False,
+                                     excludes=Excludes([]), files=files)
+        mock_scan.assert_not_called()
+        assert summary.files_copied == 2
+
+    def test_size_taken_from_scan_stat(self, src, tgt):
+        from scanner import scan_directory_with_stat
+        make_file(src / "a.jpg", b"12345")
+        [(file_path, _, st)] = list(scan_directory_with_stat(src))
+        store = CatalogStore(tgt / "media_catalog.json")
+        with patch.object(Path, "stat", side_effect=AssertionError("re-stat")):
+            assert _size_and_hash(file_path, st, "sha256", store, True) == (5, None)
+
+    def test_prescanned_files_with_stat(self, src, tgt):
+        from scanner import scan_directory_with_stat
+        make_file(src / "a.jpg", b"12345")
+        files = list(scan_directory_with_stat(src))
+        store = CatalogStore(tgt / "media_catalog.json")
+        summary = process_source(src, tgt, store=store, hash_algo="sha256",
+                                 dry_run=False, verbose=False,
+                                 excludes=Excludes([]), files=files)
+        assert summary.files_copied == 1
+        assert store.contains_size(5)
+
+
+# ── Parallel hashing ──────────────────────────────────────────────────────────
+
+class TestParallelHashing:
+    def test_multiple_workers_copy_all(self, src, tgt):
+        for i in range(20):
+            make_file(src / f"dir{i % 3}" / f"photo{i}.jpg", f"data {i}".encode())
+        summary, store = _run(src, tgt, workers=4)
+        assert summary.files_scanned == 20
+        assert summary.files_copied == 20
+        assert store.record_count() == 20
+
+    def test_duplicates_within_one_source_copied_once(self, src, tgt):
+        for i in range(10):
+            make_file(src / f"copy{i}.jpg", b"same bytes")
+        summary, _ = _run(src, tgt, workers=4)
+        assert summary.files_copied == 1
+        assert summary.files_skipped == 9
+
+    def test_hash_errors_captured_with_workers(self, src, tgt):
+        make_file(src / "good.jpg", b"ok")
+        make_file(src / "bad.jpg", b"fail")
+        real_hash = hasher.compute_hash
+
+        def flaky_hash(path, algo="sha256"):
+            if "bad" in str(path):
+                raise OSError("read error")
+            return real_hash(path, algo=algo)
+
+        with patch("catalog.compute_hash", side_effect=flaky_hash):
+            summary, _ = _run(src, tgt, workers=4)
+        assert summary.files_copied == 1
+        assert summary.files_errored == 1
+
+    def test_next_file_hashed_while_copy_in_progress(self, src, tgt):
+        make_file(src / "a.jpg", b"first")
+        make_file(src / "b.jpg", b"second")
+        real_hash = hasher.compute_hash
+        real_copy = copier.copy_file
+        both_hashed = threading.Event()
+        hashed = []
+        overlapped = []
+
+        def tracking_hash(path, algo="sha256"):
+            hashed.append(path)
+            if len(hashed) == 2:
+                both_hashed.set()
+            return real_hash(path, algo=algo)
+
+        def slow_copy(src_path, dest_path, date_taken=None):
+            # The first copy only finishes once the other file has been hashed
+            if not overlapped:
+                overlapped.append(both_hashed.wait(timeout=5))
+            return real_copy(src_path, dest_path, date_taken=date_taken)
+
+        with patch("catalog.compute_hash", side_effect=tracking_hash), \
+             patch("catalog.copy_file", side_effect=slow_copy):
+            summary, _ = _run(src, tgt, workers=1)
+        assert overlapped == [True]
+        assert summary.files_copied == 2
+
+
 # ── Error resilience ──────────────────────────────────────────────────────────
 
 class TestErrorResilience:
@@ -257,7 +489,7 @@ class TestErrorResilience:
         store = CatalogStore(catalog_path)
 
         call_count = {"n": 0}
-        real_hash = __import__("hasher").compute_hash
+        real_hash = hasher.compute_hash
 
         def flaky_hash(path, algo="sha256"):
             call_count["n"] += 1
@@ -294,7 +526,6 @@ class TestSourceLocationTracking:
         store.save()
 
         store2 = CatalogStore(catalog_path)
-        import hashlib
         h = hashlib.sha256(data).hexdigest()
         rec = store2.get(h)
         assert rec is not None
@@ -309,7 +540,6 @@ class TestSourceLocationTracking:
                        dry_run=False, verbose=False, excludes=Excludes([]))
         store.save()
 
-        import hashlib
         h = hashlib.sha256(b"unique content xyz").hexdigest()
         rec = store.get(h)
         assert rec is not None
@@ -332,7 +562,6 @@ class TestSourceLocationTracking:
                        dry_run=False, verbose=False, excludes=Excludes([]))
         store2.save()
 
-        import hashlib
         h = hashlib.sha256(data).hexdigest()
         rec = store2.get(h)
         assert rec.source_locations.count(str(src / "photo.jpg")) == 1
@@ -1,4 +1,6 @@
 """Tests for models.py — FileRecord and ScanSummary."""
+from dataclasses import fields
+
 import pytest
 
 from models import FileRecord, ScanSummary
@@ -34,6 +36,21 @@ class TestFileRecord:
             else:
                 assert isinstance(v, (str, int, float, bool, type(None)))
 
+    def test_to_dict_keys_match_dataclass_fields(self, sample_record):
+        assert list(sample_record.to_dict()) == [f.name for f in fields(FileRecord)]
+
+    def test_no_instance_dict(self, sample_record):
+        assert not hasattr(sample_record, "__dict__")
+
+    def test_from_dict_accepts_legacy_null_fields(self, sample_record):
+        d = sample_record.to_dict()
+        del d["category"]
+        d["media_type"] = None
+        d["date_source"] = None
+        rec = FileRecord.from_dict(d)
+        assert rec.category is None
+        assert rec.date_source is None
+
     def test_from_dict_missing_key_raises(self):
         incomplete = {"hash": "abc", "source_locations": ["/src"]}
         with pytest.raises(KeyError):
@@ -135,6 +152,9 @@ class TestScanSummary:
         s = ScanSummary(source_path="/Volumes/SD")
         assert s.source_path == "/Volumes/SD"
 
+    def test_no_instance_dict(self):
+        assert not hasattr(ScanSummary(source_path="/x"), "__dict__")
+
     def test_errors_list_is_independent(self):
         a = ScanSummary(source_path="/a")
         b = ScanSummary(source_path="/b")
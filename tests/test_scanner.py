@@ -1,11 +1,11 @@
 """Tests for scanner.py — scan_directory, count_files."""
-from pathlib import Path
+import os
 
 import pytest
 
 from categories import CATEGORY_OTHERS
 from excludes import Excludes
-from scanner import count_files, scan_directory
+from scanner import count_files, scan_directory, scan_directory_with_stat
 from tests.conftest import make_file
 
 
@@ -75,6 +75,27 @@ class TestScanDirectory:
         results = list(scan_directory(src))
         assert results == []
 
+    def test_hidden_directory_is_never_listed(self, src):
+        from unittest.mock import patch
+        make_file(src / ".Trashes" / "501" / "photo.jpg")
+        make_file(src / "keep.jpg")
+        listed = []
+        real_scandir = os.scandir
+
+        def recording_scandir(path):
+            listed.append(os.path.basename(path))
+            return real_scandir(path)
+
+        with patch("scanner.os.scandir", side_effect=recording_scandir):
+            results = list(scan_directory(src))
+        assert [p.name for p, _ in results] == ["keep.jpg"]
+        assert ".Trashes" not in listed
+
+    def test_hidden_source_root_still_scanned(self, tmp_path):
+        root = tmp_path / ".hidden_root"
+        make_file(root / "photo.jpg")
+        assert len(list(scan_directory(root))) == 1
+
     def test_skips_zero_byte_files(self, src):
         make_file(src / "empty.jpg", b"")
         results = list(scan_directory(src))
@@ -97,25 +118,55 @@ class TestScanDirectory:
 
     def test_skips_file_deleted_during_scan(self, src):
         from unittest.mock import patch
-        f = make_file(src / "photo.jpg")
-        
-        # Simulate the file being deleted right before stat() is called for size validation
-        original_stat = Path.stat
-        call_count = 0
-        def mock_stat(self, **kwargs):
-            nonlocal call_count
-            if self == f:
-                call_count += 1
-                # Fail on the 4th stat() call, which corresponds to file_path.stat().st_size
-                # is_dir() -> is_file() -> is_symlink() -> stat().st_size
-                if call_count >= 4:
-                    raise FileNotFoundError(f"No such file or directory: '{self}'")
-            return original_stat(self, **kwargs)
-            
-        with patch.object(Path, "stat", mock_stat):
+        make_file(src / "photo.jpg")
+        real_scandir = os.scandir
+
+        # Simulate the file being deleted right before its size is checked:
+        # the directory listing still contains it, but stat() fails.
+        class _VanishedEntry:
+            def __init__(self, entry):
+                self._entry = entry
+
+            def __getattr__(self, name):
+                return getattr(self._entry, name)
+
+            def stat(self, **kwargs):
+                raise FileNotFoundError(f"No such file or directory: '{self._entry.path}'")
+
+        class _Listing:
+            def __init__(self, path):
+                self._it = real_scandir(path)
+
+            def __enter__(self):
+                return (_VanishedEntry(e) for e in self._it)
+
+            def __exit__(self, *exc):
+                self._it.close()
+
+        with patch("scanner.os.scandir", _Listing):
             results = list(scan_directory(src))
         assert results == []
 
+    def test_skips_unreadable_directory(self, src):
+        from unittest.mock import patch
+        make_file(src / "photo.jpg")
+        with patch("scanner.os.scandir", side_effect=PermissionError("denied")):
+            assert list(scan_directory(src)) == []
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs os.mkfifo")
+    def test_skips_fifo(self, src):
+        make_file(src / "photo.jpg")
+        os.mkfifo(src / "pipe.jpg")
+        # Opening a FIFO for its size or hash would block forever
+        results = list(scan_directory(src, workers=2))
+        assert [p.name for p, _ in results] == ["photo.jpg"]
+        assert [p.name for p, _ in scan_directory(src)] == ["photo.jpg"]
+
+    def test_does_not_follow_symlinked_directories(self, src, tmp_path):
+        make_file(tmp_path / "elsewhere" / "photo.jpg")
+        (src / "linked").symlink_to(tmp_path / "elsewhere", target_is_directory=True)
+        assert list(scan_directory(src)) == []
+
     def test_exclude_directory_by_name(self, src):
         make_file(src / "dqhelper" / "photo.jpg")
         make_file(src / "photos" / "other.jpg")
@@ -132,6 +183,38 @@ class TestScanDirectory:
         assert len(results) == 1
         assert "PRIVATE" not in str(results[0][0])
 
+    def test_excluded_directory_is_never_listed(self, src):
+        from unittest.mock import patch
+        make_file(src / "dqhelper" / "deep" / "photo.jpg")
+        make_file(src / "photos" / "other.jpg")
+        listed = []
+        real_scandir = os.scandir
+
+        def recording_scandir(path):
+            listed.append(os.path.basename(path))
+            return real_scandir(path)
+
+        with patch("scanner.os.scandir", side_effect=recording_scandir):
+            results = list(scan_directory(src, excludes=Excludes(["dqhelper"])))
+        assert len(results) == 1
+        assert "dqhelper" not in listed
+        assert "deep" not in listed
+
+    def test_exclude_slash_pattern_prunes_subtree(self, src):
+        make_file(src / "logs" / "archive" / "old.jpg")
+        make_file(src / "logs" / "new.jpg")
+        results = list(scan_directory(src, excludes=Excludes(["logs/archive"])))
+        assert [p.name for p, _ in results] == ["new.jpg"]
+
+    def test_exclude_slash_pattern_matches_nested_file(self, src):
+        make_file(src / "DCIM" / "100MEDIA" / "skip.jpg")
+        make_file(src / "DCIM" / "100MEDIA" / "keep.jpg")
+        make_file(src / "skip.jpg")
+        results = list(scan_directory(src, excludes=Excludes(["DCIM/*/skip.jpg"])))
+        assert sorted(p.relative_to(src).as_posix() for p, _ in results) == [
+            "DCIM/100MEDIA/keep.jpg", "skip.jpg",
+        ]
+
     def test_exclude_file_extension(self, src):
         make_file(src / "photo.jpg")
         make_file(src / "raw.dng")
@@ -147,6 +230,75 @@ class TestScanDirectory:
         assert len(list(scan_directory(src))) == 3
 
 
+# ── Parallel listing ──────────────────────────────────────────────────────────
+
+class TestParallelScan:
+    def _tree(self, src):
+        for d in range(4):
+            for f in range(3):
+                make_file(src / f"d{d}" / f"sub{f % 2}" / f"photo{f}.jpg")
+        make_file(src / "top.mp4")
+        make_file(src / "skip" / "x.jpg")
+        make_file(src / ".hidden" / "y.jpg")
+        make_file(src / "d0" / "empty.jpg", b"")
+
+    def test_same_results_and_order_as_serial(self, src):
+        self._tree(src)
+        ex = Excludes(["skip"])
+        serial = list(scan_directory(src, excludes=ex))
+        assert len(serial) == 13
+        assert list(scan_directory(src, excludes=ex, workers=4)) == serial
+
+    def test_stat_results_match_serial(self, src):
+        self._tree(src)
+        serial = [(p, st.st_size) for p, _, st in scan_directory_with_stat(src)]
+        parallel = [(p, st.st_size) for p, _, st in scan_directory_with_stat(src, workers=4)]
+        assert parallel == serial
+
+    def test_unreadable_directory_skipped(self, src):
+        from unittest.mock import patch
+        make_file(src / "ok" / "a.jpg")
+        make_file(src / "locked" / "b.jpg")
+        real_scandir = os.scandir
+
+        def failing_scandir(path):
+            if os.path.basename(path) == "locked":
+                raise PermissionError("denied")
+            return real_scandir(path)
+
+        with patch("scanner.os.scandir", side_effect=failing_scandir):
+            results = list(scan_directory(src, workers=3))
+        assert [p.name for p, _ in results] == ["a.jpg"]
+
+    def test_stopping_early_shuts_down_pool(self, src):
+        self._tree(src)
+        gen = scan_directory(src, workers=4)
+        next(gen)
+        gen.close()   # must not hang or raise
+
+
+# ── scan_directory_with_stat ──────────────────────────────────────────────────
+
+class TestScanDirectoryWithStat:
+    def test_yields_lstat_of_each_file(self, src):
+        make_file(src / "a.jpg", b"123")
+        make_file(src / "sub" / "b.mp4", b"12345")
+        results = {p.name: (cat, st) for p, cat, st in scan_directory_with_stat(src)}
+        assert results["a.jpg"][0] == "images"
+        assert results["a.jpg"][1].st_size == 3
+        assert results["b.mp4"][1].st_size == 5
+        assert results["b.mp4"][1].st_mtime == (src / "sub" / "b.mp4").stat().st_mtime
+
+    def test_same_files_as_scan_directory(self, src):
+        make_file(src / "a.jpg")
+        make_file(src / "empty.jpg", b"")
+        make_file(src / ".hidden.jpg")
+        make_file(src / "skip" / "c.jpg")
+        ex = Excludes(["skip"])
+        assert [(p, c) for p, c, _ in scan_directory_with_stat(src, excludes=ex)] == \
+            list(scan_directory(src, excludes=ex))
+
+
 # ── count_files ────────────────────────────────────────────────────────────────
 
 class TestCountFiles: